@@ -13,9 +13,11 @@ from .const import (
     CONF_CHILDREN_GUIDS,
     CONF_DEVICE_ID,
     CONF_HOST,
+    CONF_PARTIAL_RECOVERY,
     CONF_SECRET,
     CONF_TASK_LOOKAHEAD_DAYS,
     CONF_USER_GUID,
+    DEFAULT_PARTIAL_RECOVERY,
     DEFAULT_TASK_LOOKAHEAD_DAYS,
     DOMAIN,
 )
@@ -94,6 +96,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         api=api,
         task_lookahead_days=task_lookahead_days,
         children_guids=children_guids,
+        partial_recovery=entry.options.get(CONF_PARTIAL_RECOVERY, DEFAULT_PARTIAL_RECOVERY),
     )
 
     # Fetch initial data
@@ -1,14 +1,18 @@
 """Firefly Cloud API client."""
 
 import asyncio
+import time
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from io import BytesIO
+from typing import Any, Dict, List, Optional, Tuple, cast
 from urllib.parse import quote
 from uuid import uuid4
 
 import aiohttp
 import async_timeout
 from lxml import etree
+from orjson import loads as json_loads
 
 from .const import (
     DEFAULT_APP_ID,
@@ -16,8 +20,13 @@ from .const import (
     FIREFLY_APP_GATEWAY,
     FIREFLY_GRAPHQL_PATH,
     FIREFLY_VERIFY_TOKEN_PATH,
+    MAX_EVENTS_WINDOW_DAYS,
+    MAX_RESPONSE_BYTES,
     MAX_RETRIES,
+    RESPONSE_CACHE_TTL,
     RETRY_DELAY_BASE,
+    SESSION_CONNECTION_LIMIT,
+    SESSION_KEEPALIVE_SECONDS,
     TASK_ARCHIVE_ALL,
     TASK_OWNER_ONLY_SETTERS,
     TASK_STATUS_TODO,
@@ -33,13 +42,109 @@ from .exceptions import (
     FireflyTokenExpiredError,
 )
 
+# Shared XML parser for Firefly responses; entity expansion and network access are disabled
+_XML_PARSER = etree.XMLParser(resolve_entities=False, no_network=True)
 
-class FireflyAPIClient:
+# Child lookups on the authentication token, compiled once at import
+_XP_SECRET = etree.XPath("./secret")
+_XP_USER = etree.XPath("./user")
+
+# Size of each read from a JSON response body
+_READ_CHUNK_BYTES = 64 * 1024
+
+# Marks a response cache miss, since cached results may themselves be falsy
+_CACHE_MISS = object()
+
+
+def _first_element(xpath: etree.XPath, elem: etree._Element) -> Optional[etree._Element]:
+    """Return the first element matched by a compiled XPath, or None."""
+    matches = xpath(elem)
+    if isinstance(matches, list) and matches:
+        return cast(etree._Element, matches[0])
+    return None
+
+
+def _iterparse_fields(
+    content: bytes, tags: Tuple[str, ...]
+) -> Tuple[Dict[str, str], Dict[str, Tuple[Optional[str], Dict[str, str]]]]:
+    """Stream-parse an XML document, keeping only the root attributes and the listed child elements.
+
+    Returns the root element's attributes and a mapping of tag to (text, attributes) for the
+    first direct child with each requested tag. Elements are cleared as soon as they have been
+    read so the full tree is never held in memory. Raises etree.XMLSyntaxError on invalid XML.
+    """
+    root_attrib: Dict[str, str] = {}
+    fields: Dict[str, Tuple[Optional[str], Dict[str, str]]] = {}
+
+    for _event, elem in etree.iterparse(BytesIO(content), events=("end",), resolve_entities=False, no_network=True):
+        parent = elem.getparent()
+        if parent is None:
+            root_attrib = dict(elem.attrib)
+            continue
+
+        if parent.getparent() is None and elem.tag in tags:
+            fields.setdefault(elem.tag, (elem.text, dict(elem.attrib)))
+
+        # Release elements that have already been read
+        elem.clear()
+        while elem.getprevious() is not None:
+            del parent[0]
+
+    return root_attrib, fields
+
+
+def create_session() -> aiohttp.ClientSession:
+    """Create a keep-alive pooled session for using the client outside Home Assistant.
+
+    Inside Home Assistant the integration uses the shared session from
+    aiohttp_client.async_get_clientsession, which already pools connections.
+    """
+    connector = aiohttp.TCPConnector(
+        limit=SESSION_CONNECTION_LIMIT,
+        keepalive_timeout=SESSION_KEEPALIVE_SECONDS,
+    )
+    return aiohttp.ClientSession(connector=connector)
+
+
+async def _read_json(response: aiohttp.ClientResponse) -> Any:
+    """Read and decode a JSON response body, rejecting bodies larger than MAX_RESPONSE_BYTES.
+
+    The declared Content-Length is checked before reading, and the body is read in
+    chunks that stop as soon as the cap is passed, since chunked responses declare
+    no length.
+    """
+    if response.content_length is not None and response.content_length > MAX_RESPONSE_BYTES:
+        raise FireflyDataError(f"Response too large: {response.content_length} bytes")
+
+    body = bytearray()
+    async for chunk in response.content.iter_chunked(_READ_CHUNK_BYTES):
+        body += chunk
+        if len(body) > MAX_RESPONSE_BYTES:
+            raise FireflyDataError(f"Response too large: over {MAX_RESPONSE_BYTES} bytes")
+
+    try:
+        return json_loads(body)
+    except ValueError as err:
+        raise FireflyDataError(f"Invalid JSON response: {err}") from err
+
+
+@lru_cache(maxsize=4)
+def _build_auth_url(host: str, device_id: str, app_id: str) -> str:
+    """Build the browser login URL; deterministic, so repeat calls reuse the encoded string."""
+    redirect = quote(
+        f"{host}/Login/api/gettoken?"
+        f"ffauth_device_id={device_id}&ffauth_secret="
+        f"&device_id={device_id}&app_id={app_id}"
+    )
+    return f"{host}/login/login.aspx?prelogin={redirect}"
+
+
+class FireflyAPIClient:  # pylint: disable=too-many-instance-attributes
     """Firefly Cloud API client."""
 
     def __init__(
         self,
-        session: aiohttp.ClientSession,
+        session: Optional[aiohttp.ClientSession],
         host: str,
         device_id: str,
         secret: str,
@@ -47,18 +152,63 @@ class FireflyAPIClient:
         app_id: str = DEFAULT_APP_ID,
         user_guid: Optional[str] = None,
     ) -> None:
-        """Initialize the API client."""
+        """Initialize the API client.
+
+        A passed-in session belongs to the caller and should be one long-lived session
+        reused across clients (Home Assistant's shared client session) so connections
+        are pooled; close() leaves it open. With None, the client creates its own
+        session with create_session() on first use, inside the running event loop,
+        and closes it in close().
+        """
+        self._owns_session = session is None
         self._session = session
         self._host = host.rstrip("/")
         self._device_id = device_id
         self._secret = secret
         self._app_id = app_id
         self._user_info: Optional[Dict[str, Any]] = None
+        self._response_cache: Dict[Tuple[str, ...], Tuple[float, Any]] = {}
 
         # If user_guid is provided, create minimal user info
         if user_guid:
             self._user_info = {"guid": user_guid}
 
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the session, creating the client's own one on first use."""
+        if self._session is None:
+            self._session = create_session()
+        return self._session
+
+    async def close(self) -> None:
+        """Close the session if this client created it."""
+        if self._owns_session and self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self) -> "FireflyAPIClient":
+        """Enter an async context that closes the client on exit."""
+        self._get_session()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        """Close the client."""
+        await self.close()
+
+    def _get_cached(self, key: Tuple[str, ...]) -> Any:
+        """Return a cached response result, or _CACHE_MISS if absent or expired."""
+        entry = self._response_cache.get(key)
+        if entry is None or time.monotonic() - entry[0] >= RESPONSE_CACHE_TTL:
+            return _CACHE_MISS
+        return entry[1]
+
+    def _set_cached(self, key: Tuple[str, ...], value: Any) -> None:
+        """Store a response result in the cache."""
+        self._response_cache[key] = (time.monotonic(), value)
+
+    def invalidate_cache(self) -> None:
+        """Drop all cached response results."""
+        self._response_cache.clear()
+
     @classmethod
     async def get_school_info(cls, session: aiohttp.ClientSession, school_code: str) -> Dict[str, Any]:
         """Get school information from school code."""
@@ -71,24 +221,23 @@ class FireflyAPIClient:
             async with async_timeout.timeout(TIMEOUT_SECONDS):
                 async with session.get(url) as response:
                     response.raise_for_status()
-                    content = await response.text()
+                    content = await response.read()
         except asyncio.TimeoutError as err:
             raise FireflyConnectionError("Timeout connecting to Firefly") from err
         except aiohttp.ClientError as err:
             raise FireflyConnectionError(f"Error connecting to Firefly: {err}") from err
 
         try:
-            response_elem = etree.fromstring(content.encode())
+            response_attrib, fields = _iterparse_fields(content, ("name", "installationId", "address"))
 
-            if response_elem is None or response_elem.get("exists") == "false":
+            if response_attrib.get("exists") == "false":
                 raise FireflySchoolNotFoundError(f"School not found: {school_code}")
 
-            address_elem = response_elem.find("address")
-            if address_elem is None:
+            if "address" not in fields:
                 raise FireflyDataError("Invalid school data received")
 
-            host = address_elem.text
-            ssl = address_elem.get("ssl", "false") == "true"
+            host, address_attrib = fields["address"]
+            ssl = address_attrib.get("ssl", "false") == "true"
             url = f"{'https' if ssl else 'http'}://{host}"
             device_id = str(uuid4())
 
@@ -98,16 +247,13 @@ class FireflyAPIClient:
                 f"&device_id={device_id}&app_id={DEFAULT_APP_ID}"
             )
 
-            name_elem = response_elem.find("name")
-            id_elem = response_elem.find("installationId")
-
-            if name_elem is None or id_elem is None:
+            if "name" not in fields or "installationId" not in fields:
                 raise FireflyDataError("Missing required school data")
 
             return {
-                "enabled": response_elem.get("enabled", "false") == "true",
-                "name": name_elem.text,
-                "id": id_elem.text,
+                "enabled": response_attrib.get("enabled", "false") == "true",
+                "name": fields["name"][0],
+                "id": fields["installationId"][0],
                 "host": host,
                 "ssl": ssl,
                 "url": url,
@@ -121,41 +267,45 @@ class FireflyAPIClient:
     async def get_api_version(self) -> Dict[str, int]:
         """Get the API version."""
         url = f"{self._host}{FIREFLY_API_VERSION_PATH}"
+        cache_key = ("GET", url)
+        cached = self._get_cached(cache_key)
+        if cached is not _CACHE_MISS:
+            return dict(cached)
 
         try:
             async with async_timeout.timeout(TIMEOUT_SECONDS):
-                async with self._session.get(url) as response:
+                async with self._get_session().get(url) as response:
                     response.raise_for_status()
-                    content = await response.text()
+                    content = await response.read()
         except asyncio.TimeoutError as err:
             raise FireflyConnectionError("Timeout getting API version") from err
         except aiohttp.ClientError as err:
             raise FireflyConnectionError(f"Error getting API version: {err}") from err
 
         try:
-            version_elem = etree.fromstring(content.encode())
-
-            if version_elem is None:
-                raise FireflyDataError("Invalid version response")
+            _root_attrib, fields = _iterparse_fields(content, ("majorVersion", "minorVersion", "incrementVersion"))
 
-            major_elem = version_elem.find("majorVersion")
-            minor_elem = version_elem.find("minorVersion")
-            increment_elem = version_elem.find("incrementVersion")
+            major = fields.get("majorVersion")
+            minor = fields.get("minorVersion")
+            increment = fields.get("incrementVersion")
 
-            if major_elem is None or minor_elem is None or increment_elem is None:
+            if major is None or minor is None or increment is None:
                 raise FireflyDataError("Missing version data")
 
-            if major_elem.text is None or minor_elem.text is None or increment_elem.text is None:
+            if major[0] is None or minor[0] is None or increment[0] is None:
                 raise FireflyDataError("Empty version data")
 
-            return {
-                "major": int(major_elem.text),
-                "minor": int(minor_elem.text),
-                "increment": int(increment_elem.text),
+            version = {
+                "major": int(major[0]),
+                "minor": int(minor[0]),
+                "increment": int(increment[0]),
             }
         except (etree.XMLSyntaxError, ValueError, AttributeError) as err:
             raise FireflyDataError(f"Invalid version data: {err}") from err
 
+        self._set_cached(cache_key, version)
+        return dict(version)
+
     async def verify_credentials(self) -> bool:
         """Verify that the stored credentials are valid."""
         url = f"{self._host}{FIREFLY_VERIFY_TOKEN_PATH}"
@@ -163,15 +313,20 @@ class FireflyAPIClient:
             "ffauth_device_id": self._device_id,
             "ffauth_secret": self._secret,
         }
+        # The secret is part of the key so a new secret is always verified afresh
+        cache_key = ("GET", url, self._device_id, self._secret)
+        if self._get_cached(cache_key) is not _CACHE_MISS:
+            return True
 
         try:
             async with async_timeout.timeout(TIMEOUT_SECONDS):
-                async with self._session.get(url, params=params) as response:
+                async with self._get_session().get(url, params=params) as response:
                     if response.status == 401:
-                        return False
-                    response.raise_for_status()
-                    data = await response.json()
-                    return data.get("valid", False)
+                        valid = False
+                    else:
+                        response.raise_for_status()
+                        data = await _read_json(response)
+                        valid = data.get("valid", False)
         except asyncio.TimeoutError as err:
             raise FireflyConnectionError("Timeout verifying credentials") from err
         except aiohttp.ClientResponseError as err:
@@ -181,6 +336,11 @@ class FireflyAPIClient:
         except aiohttp.ClientError as err:
             raise FireflyConnectionError(f"Error verifying credentials: {err}") from err
 
+        # Only successes are cached so fixed credentials are picked up on the next check
+        if valid:
+            self._set_cached(cache_key, True)
+        return valid
+
     async def parse_authentication_response(self, xml_response: str) -> Dict[str, Any]:
         """Parse the authentication response and extract user info and secret."""
         if not xml_response:
@@ -190,16 +350,23 @@ class FireflyAPIClient:
         xml_response = xml_response.strip()
         if xml_response.startswith('"') and xml_response.endswith('"'):
             xml_response = xml_response[1:-1]
-        xml_response = xml_response.replace('\\"', '"').replace("\\\\", "\\")
+        # A leading byte order mark is dropped with the whitespace, as lxml would accept it
+        xml_response = xml_response.replace('\\"', '"').replace("\\\\", "\\").lstrip("\ufeff \t\r\n")
+
+        # Reject input that cannot be an XML document without invoking the parser
+        if not xml_response:
+            raise FireflyAuthenticationError("Empty authentication response")
+        if not xml_response.startswith("<"):
+            raise FireflyAuthenticationError("Invalid XML in auth response: not an XML document")
 
         try:
-            token_elem = etree.fromstring(xml_response.encode())
+            token_elem = etree.fromstring(xml_response.encode(), parser=_XML_PARSER)
 
             if token_elem is None:
                 raise FireflyAuthenticationError("Invalid authentication response")
 
-            secret_elem = token_elem.find("secret")
-            user_elem = token_elem.find("user")
+            secret_elem = _first_element(_XP_SECRET, token_elem)
+            user_elem = _first_element(_XP_USER, token_elem)
 
             if secret_elem is None or user_elem is None:
                 raise FireflyAuthenticationError("Missing authentication data")
@@ -239,14 +406,14 @@ class FireflyAPIClient:
         for attempt in range(MAX_RETRIES):
             try:
                 async with async_timeout.timeout(TIMEOUT_SECONDS):
-                    async with self._session.post(url, params=params, data=data, headers=headers) as response:
+                    async with self._get_session().post(url, params=params, data=data, headers=headers) as response:
                         if response.status == 401:
                             raise FireflyTokenExpiredError("Authentication token expired")
                         if response.status == 429:
                             raise FireflyRateLimitError("Rate limit exceeded")
 
                         response.raise_for_status()
-                        result = await response.json()
+                        result = await _read_json(response)
 
                         if "errors" in result:
                             raise FireflyAPIError(f"GraphQL errors: {result['errors']}")
@@ -316,6 +483,9 @@ class FireflyAPIClient:
         if not user_guid:
             raise FireflyAuthenticationError("No user GUID available")
 
+        if (end - start).days > MAX_EVENTS_WINDOW_DAYS:
+            raise FireflyAPIError(f"Events window of {(end - start).days} days exceeds {MAX_EVENTS_WINDOW_DAYS} days")
+
         # struggling a bit with getting the events via graphql
         # query - 500 internal server error
         # Use the REST API for timetable data
@@ -352,6 +522,7 @@ class FireflyAPIClient:
     ) -> List[Dict[str, Any]]:
         """Filter events to only include those within the date range and remove duplicates."""
         import logging
+
         from homeassistant.util import dt as dt_util
 
         logger = logging.getLogger(__name__)
@@ -386,11 +557,12 @@ class FireflyAPIClient:
             return False
 
         try:
-            event_start = datetime.fromisoformat(event_start_str.replace("Z", "+00:00"))
+            # parse_datetime accepts the Z suffix directly, so no string rewriting is needed
+            event_start = dt_util.parse_datetime(event_start_str, raise_on_error=True)
             if event_start.tzinfo is None:
                 event_start = dt_util.as_utc(event_start)
             return start <= event_start < end
-        except (ValueError, AttributeError) as err:
+        except (ValueError, TypeError) as err:
             logger.warning("Error parsing event start time: %s", err)
             return False
 
@@ -406,14 +578,14 @@ class FireflyAPIClient:
         for attempt in range(MAX_RETRIES):
             try:
                 async with async_timeout.timeout(TIMEOUT_SECONDS):
-                    async with self._session.get(url, params=params) as response:
+                    async with self._get_session().get(url, params=params) as response:
                         if response.status == 401:
                             raise FireflyTokenExpiredError("Authentication token expired")
                         if response.status == 429:
                             raise FireflyRateLimitError("Rate limit exceeded")
 
                         response.raise_for_status()
-                        events_data = await response.json()
+                        events_data = await _read_json(response)
 
                         # Convert REST API format to match GraphQL format
                         converted_events = []
@@ -512,7 +684,7 @@ class FireflyAPIClient:
         for attempt in range(MAX_RETRIES):
             try:
                 async with async_timeout.timeout(TIMEOUT_SECONDS):
-                    async with self._session.post(
+                    async with self._get_session().post(
                         f"{self._host}/api/v2/taskListing/view/parent/tasks/all/filterBy",
                         params={"ffauth_device_id": self._device_id, "ffauth_secret": self._secret},
                         json=payload,
@@ -523,7 +695,7 @@ class FireflyAPIClient:
                             raise FireflyRateLimitError("Rate limit exceeded")
 
                         response.raise_for_status()
-                        data = await response.json()
+                        data = await _read_json(response)
                         return data.get("items", [])
 
             except asyncio.TimeoutError as exc:
@@ -572,9 +744,4 @@ class FireflyAPIClient:
 
     def get_auth_url(self) -> str:
         """Get the authentication URL for browser redirect."""
-        redirect = quote(
-            f"{self._host}/Login/api/gettoken?"
-            f"ffauth_device_id={self._device_id}&ffauth_secret="
-            f"&device_id={self._device_id}&app_id={self._app_id}"
-        )
-        return f"{self._host}/login/login.aspx?prelogin={redirect}"
+        return _build_auth_url(self._host, self._device_id, self._app_id)
@@ -14,12 +14,14 @@ from .const import (
     CONF_CHILDREN_GUIDS,
     CONF_DEVICE_ID,
     CONF_HOST,
+    CONF_PARTIAL_RECOVERY,
     CONF_SCHOOL_CODE,
     CONF_SCHOOL_NAME,
     CONF_SECRET,
     CONF_SHOW_CLASS_TIMES,
     CONF_TASK_LOOKAHEAD_DAYS,
     CONF_USER_GUID,
+    DEFAULT_PARTIAL_RECOVERY,
     DEFAULT_SHOW_CLASS_TIMES,
     DEFAULT_TASK_LOOKAHEAD_DAYS,
     DOMAIN,
@@ -331,6 +333,10 @@ class FireflyCloudOptionsFlowHandler(config_entries.OptionsFlow):
                         self.config_entry.data.get(CONF_SHOW_CLASS_TIMES, DEFAULT_SHOW_CLASS_TIMES),
                     ),
                 ): bool,
+                vol.Optional(
+                    CONF_PARTIAL_RECOVERY,
+                    default=self.config_entry.options.get(CONF_PARTIAL_RECOVERY, DEFAULT_PARTIAL_RECOVERY),
+                ): bool,
             }
         )
 
@@ -340,5 +346,6 @@ class FireflyCloudOptionsFlowHandler(config_entries.OptionsFlow):
             description_placeholders={
                 "task_lookahead_help": "Number of days ahead to look for upcoming tasks (1-30 days)",
                 "show_class_times_help": "Show class start/end times as prefix (e.g., '8.45-9.45: English')",
+                "partial_recovery_help": "Keep updating when some of a child's data fails to load",
             },
         )
@@ -16,11 +16,13 @@ CONF_SCHOOL_NAME = "school_name"
 CONF_HOST = "host"
 CONF_TASK_LOOKAHEAD_DAYS = "task_lookahead_days"
 CONF_SHOW_CLASS_TIMES = "show_class_times"
+CONF_PARTIAL_RECOVERY = "partial_recovery"
 
 # Defaults
 DEFAULT_SCAN_INTERVAL = timedelta(minutes=15)
 DEFAULT_TASK_LOOKAHEAD_DAYS = 7
 DEFAULT_SHOW_CLASS_TIMES = False
+DEFAULT_PARTIAL_RECOVERY = False
 DEFAULT_APP_ID = "Home Assistant Firefly Cloud Integration"
 
 # API endpoints
@@ -112,6 +114,7 @@ MAX_RETRIES = 3
 #
 TIME_OFFSET_DAYS = 0  # Days offset for testing (0 for normal operation)
 TIME_OFFSET_HOURS = 0  # Additional hour offset (can be fractional)
+_TIME_OFFSET = timedelta(days=TIME_OFFSET_DAYS, hours=TIME_OFFSET_HOURS)
 
 
 def get_offset_time() -> "datetime.datetime":
@@ -120,20 +123,21 @@ def get_offset_time() -> "datetime.datetime":
     Returns:
         datetime: Current UTC time with TIME_OFFSET_DAYS and TIME_OFFSET_HOURS applied.
     """
-    from datetime import timedelta
     from homeassistant.util import dt as dt_util
 
-    base_time = dt_util.now()
+    if not _TIME_OFFSET:
+        return dt_util.now()
 
-    if TIME_OFFSET_DAYS == 0 and TIME_OFFSET_HOURS == 0:
-        return base_time
-
-    offset = timedelta(days=TIME_OFFSET_DAYS, hours=TIME_OFFSET_HOURS)
-    return base_time + offset
+    return dt_util.now() + _TIME_OFFSET
 
 
 RETRY_DELAY_BASE = 2  # Exponential backoff base in seconds
 TIMEOUT_SECONDS = 30
+RESPONSE_CACHE_TTL = 300  # Seconds to reuse idempotent GET results
+SESSION_CONNECTION_LIMIT = 10  # Pooled connections for standalone sessions
+SESSION_KEEPALIVE_SECONDS = 60
+MAX_EVENTS_WINDOW_DAYS = 90  # Longest date range get_events will request
+MAX_RESPONSE_BYTES = 10 * 1024 * 1024  # Largest JSON response body accepted
 
 # Parallel updates
 PARALLEL_UPDATES = 1
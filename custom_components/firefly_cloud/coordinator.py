@@ -1,13 +1,15 @@
 """Data update coordinator for Firefly Cloud integration."""
 
+import asyncio
 import logging
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Coroutine, Dict, List, Optional, Sequence, Tuple, cast
 
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ConfigEntryAuthFailed
 from homeassistant.helpers import issue_registry as ir
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
 from .api import FireflyAPIClient
 from .const import DEFAULT_SCAN_INTERVAL, DEFAULT_TASK_LOOKAHEAD_DAYS, DOMAIN
@@ -15,6 +17,7 @@ from .exceptions import (
     FireflyAuthenticationError,
     FireflyConnectionError,
     FireflyDataError,
+    FireflyException,
     FireflyRateLimitError,
     FireflyTokenExpiredError,
 )
@@ -22,6 +25,30 @@ from .exceptions import (
 _LOGGER = logging.getLogger(__name__)
 
 
+def _safe_parse(value: Optional[str]) -> Optional[datetime]:
+    """Parse an ISO 8601 timestamp, returning None if it is missing or invalid."""
+    if not value:
+        return None
+    try:
+        return dt_util.parse_datetime(value)
+    except (ValueError, TypeError):
+        return None
+
+
+async def _gather_fail_fast(coros: Sequence[Coroutine[Any, Any, Any]]) -> List[Any]:
+    """Run coroutines concurrently, cancelling the rest as soon as one fails.
+
+    The first failure is raised as-is, not wrapped in an exception group, so callers
+    can handle it exactly as if the coroutines had been run one after another.
+    """
+    try:
+        async with asyncio.TaskGroup() as group:
+            tasks = [group.create_task(coro) for coro in coros]
+    except BaseExceptionGroup as err:
+        raise err.exceptions[0] from None
+    return [task.result() for task in tasks]
+
+
 class FireflyUpdateCoordinator(DataUpdateCoordinator):  # pylint: disable=too-many-instance-attributes
     """Class to manage fetching Firefly data."""
 
@@ -31,6 +58,7 @@ class FireflyUpdateCoordinator(DataUpdateCoordinator):  # pylint: disable=too-ma
         api: FireflyAPIClient,
         task_lookahead_days: int = DEFAULT_TASK_LOOKAHEAD_DAYS,
         children_guids: Optional[List[str]] = None,
+        partial_recovery: bool = False,
     ) -> None:
         """Initialize the coordinator."""
         super().__init__(
@@ -41,9 +69,15 @@ class FireflyUpdateCoordinator(DataUpdateCoordinator):  # pylint: disable=too-ma
         )
         self.api = api
         self.task_lookahead_days = task_lookahead_days
-        self.children_guids = children_guids or []
+        self._lookahead_delta = timedelta(days=task_lookahead_days)
+        # Immutable copy so later changes to the caller's list (e.g. entry data) cannot leak in
+        self.children_guids: Tuple[str, ...] = tuple(children_guids or ())
+        # When enabled, a failed request leaves that part of its child's data empty instead of failing the update
+        self.partial_recovery = partial_recovery
         self._user_info: Optional[Dict[str, Any]] = None
         self._children_info: Optional[List[Dict[str, Any]]] = None
+        # Resolved child names; cleared whenever user or children info is re-fetched
+        self._child_names: Dict[str, Optional[str]] = {}
 
         # Failure tracking for issue registry
         self.consecutive_failures = 0
@@ -67,19 +101,25 @@ class FireflyUpdateCoordinator(DataUpdateCoordinator):  # pylint: disable=too-ma
         self.statistics["last_update_time"] = update_time
 
         try:
-            await self._ensure_user_and_children_info()
-
             # Calculate date ranges and fetch data
             from .const import get_offset_time
 
             now = get_offset_time()
             date_ranges = self._calculate_date_ranges(now)
-            # _ensure_user_and_children_info guarantees _user_info is not None
-            assert self._user_info is not None
-            target_guids = self.children_guids if self.children_guids else [self._user_info["guid"]]
+
+            account_coros: List[Coroutine[Any, Any, None]] = []
+            if self.children_guids:
+                # Account info is only needed for naming here, so load it alongside the children's data
+                target_guids = self.children_guids
+                account_coros = [self._ensure_user_info(), self._ensure_children_info()]
+            else:
+                # The user's own GUID is the fetch target, so it must be known first
+                await self._ensure_user_info()
+                assert self._user_info is not None
+                target_guids = (self._user_info["guid"],)
 
             # Fetch data for all children
-            children_data = await self._fetch_all_children_data(target_guids, date_ranges, now)
+            children_data = await self._fetch_all_children_data(target_guids, date_ranges, now, account_coros)
 
             # Build response data
             data = {
@@ -160,6 +200,8 @@ class FireflyUpdateCoordinator(DataUpdateCoordinator):  # pylint: disable=too-ma
                 )
 
             raise UpdateFailed(f"Data processing error: {err}") from err
+        except UpdateFailed:  # pylint: disable=try-except-raise
+            raise
         except Exception as err:
             self._track_failure("UnexpectedError")
             self.consecutive_failures += 1
@@ -176,17 +218,21 @@ class FireflyUpdateCoordinator(DataUpdateCoordinator):  # pylint: disable=too-ma
 
             raise UpdateFailed(f"Unexpected error: {err}") from err
 
-    async def _ensure_user_and_children_info(self) -> None:
-        """Ensure user info and children info are fetched."""
+    async def _ensure_user_info(self) -> None:
+        """Ensure user info is fetched."""
         if not self._user_info:
             self._user_info = await self.api.get_user_info()
+            self._child_names.clear()
 
+    async def _ensure_children_info(self) -> None:
+        """Ensure children info is fetched."""
         if not self._children_info and self.children_guids:
             try:
                 self._children_info = await self.api.get_children_info()
             except (FireflyConnectionError, FireflyAuthenticationError, FireflyTokenExpiredError) as err:
                 _LOGGER.warning("Failed to fetch children info: %s", err)
                 self._children_info = []
+            self._child_names.clear()
 
     def _calculate_date_ranges(self, now: datetime) -> Dict[str, datetime]:
         """Calculate date ranges for data fetching."""
@@ -196,43 +242,101 @@ class FireflyUpdateCoordinator(DataUpdateCoordinator):  # pylint: disable=too-ma
             "today_end": today_start + timedelta(days=1),
             "week_start": today_start,
             "calendar_end": today_start + timedelta(days=30),
-            "task_end": today_start + timedelta(days=self.task_lookahead_days),
+            "task_end": today_start + self._lookahead_delta,
         }
 
     async def _fetch_all_children_data(
-        self, target_guids: List[str], date_ranges: Dict[str, datetime], now: datetime
+        self,
+        target_guids: Sequence[str],
+        date_ranges: Dict[str, datetime],
+        now: datetime,
+        account_coros: Sequence[Coroutine[Any, Any, None]] = (),
     ) -> Dict[str, Dict[str, Any]]:
-        """Fetch data for all children."""
-        children_data = {}
+        """Fetch data for all children concurrently, along with any pending account info."""
+        coros = [
+            *account_coros,
+            *(self.api.get_events(date_ranges["today_start"], date_ranges["today_end"], g) for g in target_guids),
+            *(self.api.get_events(date_ranges["week_start"], date_ranges["calendar_end"], g) for g in target_guids),
+            *(self.api.get_tasks(student_guid=g) for g in target_guids),
+        ]
+        account_count = len(account_coros)
+
+        if not self.partial_recovery:
+            # All or nothing: the first failure cancels the remaining requests
+            results = await _gather_fail_fast(coros)
+            return self._collect_children_data(target_guids, results[account_count:], date_ranges, now)
+
+        results = await asyncio.gather(*coros, return_exceptions=True)
+        for result in results[:account_count]:
+            if isinstance(result, BaseException):
+                raise result
+
+        return self._collect_children_data(target_guids, results[account_count:], date_ranges, now)
+
+    def _collect_children_data(
+        self, target_guids: Sequence[str], results: List[Any], date_ranges: Dict[str, datetime], now: datetime
+    ) -> Dict[str, Dict[str, Any]]:
+        """Build each child's data from the gathered results, emptying only the parts whose request failed."""
+        child_count = len(target_guids)
+        children_data: Dict[str, Dict[str, Any]] = {}
+        failures: List[BaseException] = []
+        for index, child_guid in enumerate(target_guids):
+            # Each child's today events, calendar events and tasks sit child_count apart
+            child_results = results[index::child_count]
+            for result in child_results:
+                if not isinstance(result, BaseException):
+                    continue
+                # Only Firefly errors are degraded; authentication problems affect every child
+                # and anything else is a bug, so neither is hidden
+                if isinstance(result, FireflyAuthenticationError) or not isinstance(result, FireflyException):
+                    raise result
+                _LOGGER.warning("Failed to fetch data for %s, using empty data: %s", child_guid, result)
+                failures.append(result)
+
+            events_today, events_calendar, tasks = (
+                [] if isinstance(result, BaseException) else cast(List[Dict[str, Any]], result)
+                for result in child_results
+            )
+            children_data[child_guid] = self._build_child_data(
+                child_guid, events_today, events_calendar, tasks, date_ranges=date_ranges, now=now
+            )
 
-        for child_guid in target_guids:
-            children_data[child_guid] = await self._fetch_child_data(child_guid, date_ranges, now)
+        # With nothing fetched at all there is no partial data worth keeping, so fail the update
+        # whatever mix of errors occurred rather than reporting an empty success
+        if len(failures) == len(results):
+            raise failures[0]
 
         return children_data
 
-    async def _fetch_child_data(
-        self, child_guid: str, date_ranges: Dict[str, datetime], now: datetime
+    def _build_child_data(
+        self,
+        child_guid: str,
+        events_today: List[Dict[str, Any]],
+        events_calendar: List[Dict[str, Any]],
+        tasks: List[Dict[str, Any]],
+        *,
+        date_ranges: Dict[str, datetime],
+        now: datetime,
     ) -> Dict[str, Any]:
-        """Fetch data for a single child."""
-        events_today = await self.api.get_events(date_ranges["today_start"], date_ranges["today_end"], child_guid)
-        events_calendar = await self.api.get_events(date_ranges["week_start"], date_ranges["calendar_end"], child_guid)
-        tasks = await self.api.get_tasks(student_guid=child_guid)
+        """Build the processed data for a single child."""
+        if not (events_today or events_calendar or tasks):
+            # Nothing to process, e.g. during school holidays
+            return {
+                "events": {"today": [], "week": []},
+                "tasks": {"all": [], "due_today": [], "upcoming": [], "overdue": []},
+                "name": self._child_name(child_guid),
+            }
 
         return {
             "events": {
                 "today": self._process_events(events_today),
                 "week": self._process_events(events_calendar),
             },
-            "tasks": {
-                "all": self._process_tasks(tasks),
-                "due_today": self._filter_tasks_by_date(tasks, date_ranges["today_start"], date_ranges["today_end"]),
-                "upcoming": self._filter_tasks_by_date(tasks, now, date_ranges["task_end"]),
-                "overdue": self._filter_overdue_tasks(tasks, now),
-            },
-            "name": self._extract_child_name(child_guid),
+            "tasks": self._bucket_tasks(self._process_tasks(tasks), date_ranges, now),
+            "name": self._child_name(child_guid),
         }
 
-    def _log_update_statistics(self, target_guids: List[str], children_data: Dict[str, Dict[str, Any]]) -> None:
+    def _log_update_statistics(self, target_guids: Sequence[str], children_data: Dict[str, Dict[str, Any]]) -> None:
         """Log statistics about the update."""
         total_events_today = 0
         total_events_week = 0
@@ -263,9 +367,14 @@ class FireflyUpdateCoordinator(DataUpdateCoordinator):  # pylint: disable=too-ma
 
         for event in events:
             try:
+                start = _safe_parse(event["start"])
+                end = _safe_parse(event["end"])
+                if start is None or end is None:
+                    raise ValueError(f"Invalid event time: {event['start']!r} - {event['end']!r}")
+
                 processed_event = {
-                    "start": datetime.fromisoformat(event["start"].replace("Z", "+00:00")),
-                    "end": datetime.fromisoformat(event["end"].replace("Z", "+00:00")),
+                    "start": start,
+                    "end": end,
                     "subject": event.get("subject", "Unknown Subject"),
                     "location": event.get("location"),
                     "description": event.get("description"),
@@ -290,23 +399,14 @@ class FireflyUpdateCoordinator(DataUpdateCoordinator):  # pylint: disable=too-ma
                 due_date_str = task.get("dueDate")
                 set_date_str = task.get("setDate")
 
-                # Handle due date parsing with fallback for invalid dates
-                due_date = None
-                if due_date_str:
-                    try:
-                        due_date = datetime.fromisoformat(due_date_str.replace("Z", "+00:00"))
-                    except (ValueError, TypeError):
-                        _LOGGER.debug("Invalid due date format: %s", due_date_str)
-                        due_date = None
-
-                # Handle set date parsing with fallback
-                set_date = None
-                if set_date_str:
-                    try:
-                        set_date = datetime.fromisoformat(set_date_str.replace("Z", "+00:00"))
-                    except (ValueError, TypeError):
-                        _LOGGER.debug("Invalid set date format: %s", set_date_str)
-                        set_date = None
+                # Invalid dates fall back to None rather than dropping the task
+                due_date = _safe_parse(due_date_str)
+                if due_date_str and due_date is None:
+                    _LOGGER.debug("Invalid due date format: %s", due_date_str)
+
+                set_date = _safe_parse(set_date_str)
+                if set_date_str and set_date is None:
+                    _LOGGER.debug("Invalid set date format: %s", set_date_str)
 
                 # Extract subject information
                 subject = "Unknown Subject"
@@ -339,70 +439,39 @@ class FireflyUpdateCoordinator(DataUpdateCoordinator):  # pylint: disable=too-ma
 
         return processed_tasks
 
-    def _filter_tasks_by_date(
-        self, tasks: List[Dict[str, Any]], start: datetime, end: datetime
-    ) -> List[Dict[str, Any]]:
-        """Filter tasks by date range."""
-        filtered_tasks = []
-
-        # Ensure start and end are timezone-aware for comparison
-        if start.tzinfo is None:
-            start = start.replace(tzinfo=timezone.utc)
-        if end.tzinfo is None:
-            end = end.replace(tzinfo=timezone.utc)
-
-        for task in tasks:
-            due_date_str = task.get("dueDate")
-            if not due_date_str:
-                continue
+    def _bucket_tasks(
+        self, all_tasks: List[Dict[str, Any]], date_ranges: Dict[str, datetime], now: datetime
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Sort processed tasks into the all/due_today/upcoming/overdue buckets in a single pass."""
+        due_today: List[Dict[str, Any]] = []
+        upcoming: List[Dict[str, Any]] = []
+        overdue: List[Dict[str, Any]] = []
+
+        # Ensure boundaries are timezone-aware for comparison
+        today_start, today_end, task_end = (
+            bound if bound.tzinfo else bound.replace(tzinfo=timezone.utc)
+            for bound in (date_ranges["today_start"], date_ranges["today_end"], date_ranges["task_end"])
+        )
+        if now.tzinfo is None:
+            now = now.replace(tzinfo=timezone.utc)
 
-            try:
-                # Parse the due date and ensure it's timezone-aware
-                if due_date_str.endswith("Z"):
-                    due_date = datetime.fromisoformat(due_date_str.replace("Z", "+00:00"))
-                else:
-                    # If no timezone info, parse as naive then add UTC timezone
-                    due_date = datetime.fromisoformat(due_date_str)
-                    if due_date.tzinfo is None:
-                        due_date = due_date.replace(tzinfo=timezone.utc)
-
-                if start <= due_date < end:
-                    filtered_tasks.append(task)
-            except ValueError:
+        for task in all_tasks:
+            due_date = task["due_date"]
+            if due_date is None:
                 continue
 
-        return self._process_tasks(filtered_tasks)
+            # If no timezone info, treat the due date as UTC
+            if due_date.tzinfo is None:
+                due_date = due_date.replace(tzinfo=timezone.utc)
 
-    def _filter_overdue_tasks(self, tasks: List[Dict[str, Any]], now: datetime) -> List[Dict[str, Any]]:
-        """Filter overdue tasks."""
-        overdue_tasks = []
+            if today_start <= due_date < today_end:
+                due_today.append(task)
+            if now <= due_date < task_end:
+                upcoming.append(task)
+            elif due_date < now and task["completion_status"].lower() != "completed":
+                overdue.append(task)
 
-        for task in tasks:
-            due_date_str = task.get("dueDate")
-            completion_status = task.get("completionStatus", "")
-
-            if not due_date_str or completion_status.lower() == "completed":
-                continue
-
-            try:
-                if due_date_str.endswith("Z"):
-                    due_date = datetime.fromisoformat(due_date_str.replace("Z", "+00:00"))
-                else:
-                    # If no timezone info, parse as naive then add UTC timezone
-                    due_date = datetime.fromisoformat(due_date_str)
-                    if due_date.tzinfo is None:
-                        due_date = due_date.replace(tzinfo=timezone.utc)
-
-                # Ensure now is timezone-aware
-                if now.tzinfo is None:
-                    now = now.replace(tzinfo=timezone.utc)
-
-                if due_date < now:
-                    overdue_tasks.append(task)
-            except ValueError:
-                continue
-
-        return self._process_tasks(overdue_tasks)
+        return {"all": all_tasks, "due_today": due_today, "upcoming": upcoming, "overdue": overdue}
 
     def get_events_for_day(self, target_date: datetime) -> List[Dict[str, Any]]:
         """Get events for a specific day."""
@@ -423,6 +492,12 @@ class FireflyUpdateCoordinator(DataUpdateCoordinator):  # pylint: disable=too-ma
         week_events = self.data["events"]["week"]
         return [event for event in week_events if day_start <= event["start"] < day_end]
 
+    def _child_name(self, child_guid: str) -> Optional[str]:
+        """Return the child's name, resolving it only once per fetch of user and children info."""
+        if child_guid not in self._child_names:
+            self._child_names[child_guid] = self._extract_child_name(child_guid)
+        return self._child_names[child_guid]
+
     def _extract_child_name(self, child_guid: str) -> Optional[str]:
         """Extract child name from user info or children info."""
         # Check if this is the main user account
@@ -15,7 +15,7 @@ import asyncio
 import logging
 from datetime import datetime, timedelta
 
-from custom_components.firefly_cloud.api import FireflyAPIClient
+from custom_components.firefly_cloud.api import FireflyAPIClient, create_session
 from custom_components.firefly_cloud.exceptions import (
     FireflyException,
     FireflySchoolNotFoundError,
@@ -35,8 +35,7 @@ async def test_school_lookup():
     
     # Test with a fake school code (should fail gracefully)
     try:
-        import aiohttp
-        async with aiohttp.ClientSession() as session:
+        async with create_session() as session:
             result = await FireflyAPIClient.get_school_info(session, "testschool")
             logger.info("School lookup result: %s", result)
     except FireflySchoolNotFoundError as e:
@@ -49,8 +48,7 @@ async def test_api_client_creation():
     """Test API client creation and basic functionality."""
     logger.info("Testing API client creation...")
     
-    import aiohttp
-    async with aiohttp.ClientSession() as session:
+    async with create_session() as session:
         client = FireflyAPIClient(
             session=session,
             host="https://example.fireflycloud.net",
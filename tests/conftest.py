@@ -1,15 +1,20 @@
 """Test configuration for Firefly Cloud integration."""
 
-import inspect
-from contextlib import ExitStack
+import copy
+import functools
+from collections.abc import Mapping
+from contextlib import ExitStack, contextmanager
 from datetime import datetime, timedelta
 from types import MappingProxyType
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import orjson
 import pytest
 import pytest_asyncio
-from homeassistant.config_entries import ConfigEntry
+from homeassistant.config_entries import HANDLERS, ConfigEntry
 
+from custom_components.firefly_cloud.api import FireflyAPIClient
+from custom_components.firefly_cloud.config_flow import FireflyCloudConfigFlow
 from custom_components.firefly_cloud.const import (
     CONF_CHILDREN_GUIDS,
     CONF_DEVICE_ID,
@@ -23,6 +28,24 @@ from custom_components.firefly_cloud.const import (
     DOMAIN,
 )
 
+# Register the config flow handler once for the whole test session
+HANDLERS[DOMAIN] = FireflyCloudConfigFlow
+
+# Static integration metadata returned by the patched integration loader
+_MOCK_INTEGRATION = AsyncMock()
+_MOCK_INTEGRATION.domain = DOMAIN
+_MOCK_INTEGRATION.name = "Firefly Cloud"
+_MOCK_INTEGRATION.dependencies = set()
+_MOCK_INTEGRATION.requirements = []
+_MOCK_INTEGRATION.config_flow = True
+
+
+# ConfigEntry keyword arguments that only exist in some Home Assistant versions
+_VERSION_SPECIFIC_ENTRY_KWARGS = ("subentries_data", "discovery_keys")
+
+# Version-specific keyword arguments the installed ConfigEntry rejected, learned on first use
+_UNSUPPORTED_ENTRY_KWARGS: set[str] = set()
+
 
 def create_config_entry_with_version_compat(**kwargs):
     """Create a ConfigEntry with version-compatible parameters.
@@ -30,32 +53,60 @@ def create_config_entry_with_version_compat(**kwargs):
     Home Assistant versions have different required/optional parameters:
     - 2025.x: requires 'subentries_data', has 'discovery_keys'
     - Older: doesn't have 'subentries_data' or 'discovery_keys'
-    """
-    # Check if ConfigEntry.__init__ accepts parameters
-    sig = inspect.signature(ConfigEntry.__init__)
-    params = sig.parameters
-
-    # Handle subentries_data (required in 2025.x, doesn't exist in older)
-    if "subentries_data" in params:
-        # HA 2025.x and newer - subentries_data is required
-        if "subentries_data" not in kwargs:
-            kwargs["subentries_data"] = {}
-    else:
-        # Older HA versions - subentries_data doesn't exist
-        kwargs.pop("subentries_data", None)
 
-    # Handle discovery_keys (exists in newer versions, not in older)
-    if "discovery_keys" not in params:
-        # Older HA versions don't have discovery_keys parameter
-        kwargs.pop("discovery_keys", None)
-
-    return ConfigEntry(**kwargs)
+    The first call tries the newest signature and drops any parameter the
+    installed version rejects; the result is remembered for later calls.
+    """
+    # subentries_data is required in 2025.x and newer
+    kwargs.setdefault("subentries_data", {})
+    for name in _UNSUPPORTED_ENTRY_KWARGS:
+        kwargs.pop(name, None)
+
+    while True:
+        try:
+            return ConfigEntry(**kwargs)
+        except TypeError as err:
+            unsupported = next(
+                (name for name in _VERSION_SPECIFIC_ENTRY_KWARGS if name in kwargs and f"'{name}'" in str(err)),
+                None,
+            )
+            if unsupported is None:
+                raise
+            _UNSUPPORTED_ENTRY_KWARGS.add(unsupported)
+            kwargs.pop(unsupported)
+
+
+def _freeze(value):
+    """Recursively convert dicts to ``MappingProxyType`` and lists to tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def copy_fixture(value):
+    """Return a mutable deep copy of a frozen fixture value.
+
+    Data fixtures return read-only ``MappingProxyType``/``tuple`` structures so
+    they can be shared safely. Tests that need to mutate the data should work on
+    a copy made with this helper (mappings become dicts, tuples become lists).
+
+    Frozen data must also be copied before it reaches coordinator code, which
+    checks for ``dict`` and would silently skip read-only mappings, and before
+    it is compared with decoded API results, which are lists rather than tuples.
+    """
+    if isinstance(value, Mapping):
+        return {key: copy_fixture(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [copy_fixture(item) for item in value]
+    return copy.deepcopy(value)
 
 
 # Configure pytest for Home Assistant testing
-@pytest_asyncio.fixture
-async def hass():
-    """Return a Home Assistant instance for testing."""
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def hass_session():
+    """Return a Home Assistant instance shared by the whole test session."""
     import tempfile
 
     from homeassistant.config_entries import ConfigEntries
@@ -86,16 +137,10 @@ async def hass():
         # This is required in older HA versions where it's not automatically initialized
         hass.data["issue_registry"] = MagicMock()
 
-        # Mock the integration registry and loader
-        mock_integration = AsyncMock()
-        mock_integration.domain = "firefly_cloud"
-        mock_integration.name = "Firefly Cloud"
-        mock_integration.dependencies = set()
-        mock_integration.requirements = []
-        mock_integration.config_flow = True
-        mock_integration.file_path = temp_dir + "/custom_components/firefly_cloud"
+        # Mock the integration registry and loader (only the path varies per instance)
+        _MOCK_INTEGRATION.file_path = temp_dir + "/custom_components/firefly_cloud"
 
-        # Setup required Home Assistant components and register config flow
+        # Setup required Home Assistant components
         # Check if report_usage exists before patching (it doesn't in older HA versions)
         import homeassistant.helpers.frame as frame_module
 
@@ -103,20 +148,13 @@ async def hass():
         if hasattr(frame_module, "report_usage"):
             frame_patches.append(patch("homeassistant.helpers.frame.report_usage"))
 
-        with patch("homeassistant.loader.async_get_integration", return_value=mock_integration):
+        with patch("homeassistant.loader.async_get_integration", return_value=_MOCK_INTEGRATION):
             with patch("homeassistant.helpers.integration_platform.async_process_integration_platforms"):
                 # Apply frame patches only if they exist
                 with ExitStack() as stack:
                     for frame_patch in frame_patches:
                         stack.enter_context(frame_patch)
 
-                    # Import and register the config flow handler manually
-                    from homeassistant.config_entries import HANDLERS
-
-                    from custom_components.firefly_cloud.config_flow import FireflyCloudConfigFlow
-
-                    HANDLERS["firefly_cloud"] = FireflyCloudConfigFlow
-
                     await hass.async_start()
                     try:
                         yield hass
@@ -124,57 +162,105 @@ async def hass():
                         await hass.async_stop()
 
 
+@pytest_asyncio.fixture
+async def hass(hass_session):
+    """Return the shared Home Assistant instance, reset after each test."""
+    from homeassistant.config_entries import ConfigEntries
+
+    yield hass_session
+
+    # Drop config entries, in-progress flows and integration data left behind by the test
+    hass_session.config_entries = ConfigEntries(hass_session, {})
+    hass_session.data.pop(DOMAIN, None)
+    await hass_session.async_block_till_done()
+
+
+# Default ConfigEntry arguments for build_config_entry
+_DEFAULT_ENTRY_KWARGS = MappingProxyType(
+    {
+        "version": 1,
+        "minor_version": 1,
+        "domain": DOMAIN,
+        "title": "Test School - John Doe",
+        "options": {},
+        "entry_id": "test-entry-id",
+        "unique_id": "test-unique-id",
+        "source": "user",
+        "discovery_keys": MappingProxyType({}),
+    }
+)
+
+# Default entry data for build_config_entry
+_DEFAULT_ENTRY_DATA = MappingProxyType(
+    {
+        CONF_SCHOOL_CODE: "testschool",
+        CONF_SCHOOL_NAME: "Test School",
+        CONF_HOST: "https://testschool.fireflycloud.net",
+        CONF_DEVICE_ID: "test-device-123",
+        CONF_SECRET: "test-secret-456",
+        CONF_USER_GUID: "test-user-789",
+        CONF_CHILDREN_GUIDS: ("test-child-123", "test-child-456"),
+        CONF_TASK_LOOKAHEAD_DAYS: DEFAULT_TASK_LOOKAHEAD_DAYS,
+    }
+)
+
+
+def build_config_entry(**overrides) -> ConfigEntry:
+    """Build a config entry from the test defaults.
+
+    A ``data`` override is merged into the default entry data; any other
+    keyword replaces the matching ConfigEntry argument.
+    """
+    data = {**_DEFAULT_ENTRY_DATA, **overrides.pop("data", {})}
+    data[CONF_CHILDREN_GUIDS] = list(data[CONF_CHILDREN_GUIDS])
+    return create_config_entry_with_version_compat(**{**_DEFAULT_ENTRY_KWARGS, **overrides, "data": data})
+
+
+def add_to_hass(hass, entry: ConfigEntry) -> ConfigEntry:
+    """Register a config entry with hass without setting it up.
+
+    Mirrors MockConfigEntry.add_to_hass: the entry registry keeps its domain and
+    unique_id indexes up to date on insert, so no storage save is scheduled.
+    """
+    hass.config_entries._entries[entry.entry_id] = entry
+    return entry
+
+
 @pytest.fixture
 def mock_config_entry() -> ConfigEntry:
     """Return a mock config entry."""
-    return create_config_entry_with_version_compat(
-        version=1,
-        minor_version=1,
-        domain=DOMAIN,
-        title="Test School - John Doe",
-        data={
-            CONF_SCHOOL_CODE: "testschool",
-            CONF_SCHOOL_NAME: "Test School",
-            CONF_HOST: "https://testschool.fireflycloud.net",
-            CONF_DEVICE_ID: "test-device-123",
-            CONF_SECRET: "test-secret-456",
-            CONF_USER_GUID: "test-user-789",
-            CONF_CHILDREN_GUIDS: ["test-child-123", "test-child-456"],
-            CONF_TASK_LOOKAHEAD_DAYS: DEFAULT_TASK_LOOKAHEAD_DAYS,
-        },
-        options={},
-        entry_id="test-entry-id",
-        unique_id="test-unique-id",
-        source="user",
-        discovery_keys=MappingProxyType({}),
-    )
+    return build_config_entry()
 
 
 @pytest.fixture
 def mock_school_info():
     """Return mock school info."""
-    return {
-        "enabled": True,
-        "name": "Test School",
-        "id": "test-installation-id",
-        "host": "testschool.fireflycloud.net",
-        "ssl": True,
-        "url": "https://testschool.fireflycloud.net",
-        "token_url": "https://testschool.fireflycloud.net/login/login.aspx?prelogin=...",
-        "device_id": "test-device-123",
-    }
+    return _freeze(
+        {
+            "enabled": True,
+            "name": "Test School",
+            "id": "test-installation-id",
+            "host": "testschool.fireflycloud.net",
+            "ssl": True,
+            "url": "https://testschool.fireflycloud.net",
+            "token_url": "https://testschool.fireflycloud.net/login/login.aspx?prelogin=...",
+            "device_id": "test-device-123",
+        }
+    )
 
 
 @pytest.fixture
 def mock_user_info():
     """Return mock user info."""
-    return {
-        "username": "john.doe",
-        "fullname": "John Doe",
-        "email": "john.doe@test.com",
-        "role": "student",
-        "guid": "test-user-789",
-    }
+    return _freeze(
+        {
+            "username": "john.doe",
+            "fullname": "John Doe",
+            "email": "john.doe@test.com",
+            "role": "student",
+            "guid": "test-user-789",
+        }
+    )
 
 
 @pytest.fixture
@@ -183,35 +269,37 @@ def mock_events():
     now = datetime.now()
     today = now.replace(hour=9, minute=0, second=0, microsecond=0)
 
-    return [
-        {
-            "start": today.isoformat() + "Z",
-            "end": (today + timedelta(hours=1)).isoformat() + "Z",
-            "subject": "Mathematics",
-            "location": "Room 101",
-            "description": "Algebra lesson",
-            "guild": None,
-            "attendees": [],
-        },
-        {
-            "start": (today + timedelta(hours=1)).isoformat() + "Z",
-            "end": (today + timedelta(hours=2)).isoformat() + "Z",
-            "subject": "English Literature",
-            "location": "Room 201",
-            "description": "Shakespeare analysis",
-            "guild": None,
-            "attendees": [],
-        },
-        {
-            "start": (today + timedelta(hours=2)).isoformat() + "Z",
-            "end": (today + timedelta(hours=3)).isoformat() + "Z",
-            "subject": "Physical Education",
-            "location": "Gymnasium",
-            "description": "Sports kit required",
-            "guild": None,
-            "attendees": [],
-        },
-    ]
+    return _freeze(
+        [
+            {
+                "start": today.isoformat() + "Z",
+                "end": (today + timedelta(hours=1)).isoformat() + "Z",
+                "subject": "Mathematics",
+                "location": "Room 101",
+                "description": "Algebra lesson",
+                "guild": None,
+                "attendees": [],
+            },
+            {
+                "start": (today + timedelta(hours=1)).isoformat() + "Z",
+                "end": (today + timedelta(hours=2)).isoformat() + "Z",
+                "subject": "English Literature",
+                "location": "Room 201",
+                "description": "Shakespeare analysis",
+                "guild": None,
+                "attendees": [],
+            },
+            {
+                "start": (today + timedelta(hours=2)).isoformat() + "Z",
+                "end": (today + timedelta(hours=3)).isoformat() + "Z",
+                "subject": "Physical Education",
+                "location": "Gymnasium",
+                "description": "Sports kit required",
+                "guild": None,
+                "attendees": [],
+            },
+        ]
+    )
 
 
 @pytest.fixture
@@ -221,53 +309,57 @@ def mock_tasks():
     tomorrow = now + timedelta(days=1)
     next_week = now + timedelta(days=7)
 
-    return [
-        {
-            "guid": "task-1",
-            "title": "Math Homework - Chapter 5",
-            "description": "Complete exercises 1-20 from Chapter 5",
-            "dueDate": tomorrow.isoformat() + "Z",
-            "setDate": (now - timedelta(days=1)).isoformat() + "Z",
-            "subject": {"name": "Mathematics"},
-            "completionStatus": "Todo",
-            "setter": {"name": "Mr. Smith"},
-        },
-        {
-            "guid": "task-2",
-            "title": "History Essay - World War II",
-            "description": "Write a 1000-word essay on WWII causes",
-            "dueDate": next_week.isoformat() + "Z",
-            "setDate": (now - timedelta(days=3)).isoformat() + "Z",
-            "subject": {"name": "History"},
-            "completionStatus": "Todo",
-            "setter": {"name": "Mrs. Johnson"},
-        },
-        {
-            "guid": "task-3",
-            "title": "Science Test Preparation",
-            "description": "Study for chemistry test",
-            "dueDate": (now + timedelta(days=3)).isoformat() + "Z",
-            "setDate": now.isoformat() + "Z",
-            "subject": {"name": "Science"},
-            "completionStatus": "Todo",
-            "setter": {"name": "Dr. Brown"},
-        },
-    ]
+    return _freeze(
+        [
+            {
+                "guid": "task-1",
+                "title": "Math Homework - Chapter 5",
+                "description": "Complete exercises 1-20 from Chapter 5",
+                "dueDate": tomorrow.isoformat() + "Z",
+                "setDate": (now - timedelta(days=1)).isoformat() + "Z",
+                "subject": {"name": "Mathematics"},
+                "completionStatus": "Todo",
+                "setter": {"name": "Mr. Smith"},
+            },
+            {
+                "guid": "task-2",
+                "title": "History Essay - World War II",
+                "description": "Write a 1000-word essay on WWII causes",
+                "dueDate": next_week.isoformat() + "Z",
+                "setDate": (now - timedelta(days=3)).isoformat() + "Z",
+                "subject": {"name": "History"},
+                "completionStatus": "Todo",
+                "setter": {"name": "Mrs. Johnson"},
+            },
+            {
+                "guid": "task-3",
+                "title": "Science Test Preparation",
+                "description": "Study for chemistry test",
+                "dueDate": (now + timedelta(days=3)).isoformat() + "Z",
+                "setDate": now.isoformat() + "Z",
+                "subject": {"name": "Science"},
+                "completionStatus": "Todo",
+                "setter": {"name": "Dr. Brown"},
+            },
+        ]
+    )
 
 
 @pytest.fixture
 def mock_api_responses(mock_events, mock_tasks):
     """Return mock API responses."""
-    return {
-        "events": mock_events,
-        "tasks": {"items": mock_tasks},
-        "version": {
-            "majorVersion": 1,
-            "minorVersion": 0,
-            "incrementVersion": 0,
-        },
-        "verify_token": {"valid": True},
-    }
+    return _freeze(
+        {
+            "events": mock_events,
+            "tasks": {"items": mock_tasks},
+            "version": {
+                "majorVersion": 1,
+                "minorVersion": 0,
+                "incrementVersion": 0,
+            },
+            "verify_token": {"valid": True},
+        }
+    )
 
 
 @pytest.fixture
@@ -372,47 +464,168 @@ def mock_coordinator_data():
     }
 
 
-def mock_http_response(text="", json_data=None, status=200, raise_for_status_exception=None):
-    """Create a mock HTTP response."""
-    response = AsyncMock()
-    response.text = AsyncMock(return_value=text)
-    if json_data:
-        response.json = AsyncMock(return_value=json_data)
-    response.status = status
+def mock_http_response(text="", json_data=None, status=200, raise_for_status_exception=None, content_length=None):
+    """Create a stub HTTP response.
+
+    text may be str or bytes and is served as the response body. json_data,
+    if given, is serialized once with orjson and served as the body instead.
+    Responses that only set a status are built once per status and shared, so
+    callers must not modify them.
+    """
+    if not text and json_data is None and raise_for_status_exception is None and content_length is None:
+        return _status_http_response(status)
+    if json_data is not None:
+        text = orjson.dumps(json_data, default=_dump_frozen)
+    return StubResponse(text, status, raise_for_status_exception, content_length)
 
-    if raise_for_status_exception:
-        response.raise_for_status = MagicMock(side_effect=raise_for_status_exception)
-    else:
-        response.raise_for_status = MagicMock()
-    return response
 
+def _dump_frozen(value):
+    """Serialize the read-only mappings that frozen fixtures are made of."""
+    if isinstance(value, Mapping):
+        return dict(value)
+    raise TypeError
 
-@pytest.fixture
+
+@functools.lru_cache(maxsize=None)
+def _status_http_response(status):
+    """Return the shared stub response for a bare status code."""
+    return StubResponse("", status, None, None)
+
+
+class StubStream:
+    """Minimal aiohttp StreamReader stand-in serving a fixed body."""
+
+    def __init__(self, body):
+        """Store the body to serve."""
+        self._body = body
+
+    async def iter_chunked(self, size):
+        """Yield the body in chunks of at most size bytes."""
+        for start in range(0, len(self._body), size):
+            yield self._body[start : start + size]
+
+
+class StubResponse:
+    """Minimal aiohttp response stand-in that is also its own async context manager.
+
+    Implements only what FireflyAPIClient uses, avoiding AsyncMock's per-call
+    bookkeeping on every request made by the API tests.
+    """
+
+    def __init__(self, text, status, raise_for_status_exception, content_length):
+        """Store the canned body, status and optional raise_for_status error."""
+        self._body = text if isinstance(text, bytes) else text.encode()
+        self._exception = raise_for_status_exception
+        self.status = status
+        self.content_length = content_length
+        self.content = StubStream(self._body)
+
+    async def __aenter__(self):
+        """Return the response itself, as `async with session.get(...)` expects."""
+        return self
+
+    async def __aexit__(self, *_exc_info):
+        """Nothing to release."""
+
+    async def read(self):
+        """Return the body as bytes."""
+        return self._body
+
+    async def text(self):
+        """Return the body decoded as text."""
+        return self._body.decode()
+
+    def raise_for_status(self):
+        """Raise the configured exception, if any."""
+        if self._exception is not None:
+            raise self._exception
+
+
+class AsyncStub:
+    """Lightweight stand-in for an async method that returns a fixed value and records its calls."""
+
+    def __init__(self, return_value=None, side_effect=None):
+        """Return return_value from every call, or raise side_effect if given."""
+        self.return_value = return_value
+        self.side_effect = side_effect
+        self.calls = []
+
+    async def __call__(self, *args, **kwargs):
+        """Record the call and return or raise the configured result."""
+        self.calls.append((args, kwargs))
+        if self.side_effect is not None:
+            raise self.side_effect
+        return self.return_value
+
+
+@contextmanager
+def swap_attr(obj, name, value):
+    """Temporarily replace an attribute, restoring the original on exit.
+
+    An attribute that obj only inherited (e.g. a method swapped on an instance)
+    is removed again rather than shadowed by the original value.
+    """
+    inherited = name not in vars(obj)
+    original = getattr(obj, name)
+    setattr(obj, name, value)
+    try:
+        yield value
+    finally:
+        if inherited:
+            delattr(obj, name)
+        else:
+            setattr(obj, name, original)
+
+
+@pytest.fixture(scope="session")
 def mock_aiohttp_session():
-    """Return a mock aiohttp session."""
+    """Return a mock aiohttp session shared by the whole test session."""
     session = MagicMock()
 
     # Store for configuring responses per test
     session._mock_responses = {}
 
-    # Create async context manager mocks that return configured responses
-    def create_context_manager_for_get(*_args, **_kwargs):  # pylint: disable=unused-argument
-        context_manager = AsyncMock()
-        # Use the stored response or create a default one
-        response = session._mock_responses.get("get", mock_http_response())
-        context_manager.__aenter__.return_value = response
-        context_manager.__aexit__.return_value = None
-        return context_manager
-
-    def create_context_manager_for_post(*_args, **_kwargs):  # pylint: disable=unused-argument
-        context_manager = AsyncMock()
-        # Use the stored response or create a default one
-        response = session._mock_responses.get("post", mock_http_response())
-        context_manager.__aenter__.return_value = response
-        context_manager.__aexit__.return_value = None
-        return context_manager
-
-    session.get = MagicMock(side_effect=create_context_manager_for_get)
-    session.post = MagicMock(side_effect=create_context_manager_for_post)
+    # Responses are their own async context managers; MagicMock only records the calls
+    def respond_to_get(*_args, **_kwargs):  # pylint: disable=unused-argument
+        return session._mock_responses.get("get") or _status_http_response(200)
+
+    def respond_to_post(*_args, **_kwargs):  # pylint: disable=unused-argument
+        return session._mock_responses.get("post") or _status_http_response(200)
+
+    session.get = MagicMock(side_effect=respond_to_get)
+    session.post = MagicMock(side_effect=respond_to_post)
 
     return session
+
+
+@pytest.fixture(scope="session")
+def api_client(mock_aiohttp_session):
+    """Return a FireflyAPIClient on the mock session, shared by the whole test session.
+
+    Modules using it must reset the state their tests change (see test_api.py).
+    """
+    return FireflyAPIClient(
+        session=mock_aiohttp_session,
+        host="https://testschool.fireflycloud.net",
+        device_id="test-device-123",
+        secret="test-secret-456",
+    )
+
+
+@pytest.fixture
+def set_mock_response(mock_aiohttp_session):
+    """Return a helper that configures the shared mock session's response for "get" or "post"."""
+
+    def _set(method, **kwargs):
+        mock_aiohttp_session._mock_responses[method] = mock_http_response(**kwargs)
+
+    return _set
+
+
+@pytest.fixture(autouse=True)
+def _reset_mock_aiohttp_session(mock_aiohttp_session):
+    """Clear configured responses and recorded calls on the shared mock session after each test."""
+    yield
+    mock_aiohttp_session._mock_responses.clear()
+    mock_aiohttp_session.get.reset_mock()
+    mock_aiohttp_session.post.reset_mock()
@@ -1,98 +1,107 @@
 """Test the Firefly Cloud calendar platform."""
 
+import copy
 from datetime import datetime, timedelta, timezone
-from types import MappingProxyType
 from unittest.mock import MagicMock
 
 import pytest
 from homeassistant.components.calendar import CalendarEvent
-from conftest import create_config_entry_with_version_compat
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 from homeassistant.util import dt as dt_util
 
 from custom_components.firefly_cloud.calendar import (
     FireflyCalendar,
     async_setup_entry,
 )
-from custom_components.firefly_cloud.const import (
-    CONF_CHILDREN_GUIDS,
-    CONF_DEVICE_ID,
-    CONF_HOST,
-    CONF_SCHOOL_NAME,
-    CONF_SECRET,
-    CONF_USER_GUID,
-    DOMAIN,
-)
+from custom_components.firefly_cloud.const import CONF_CHILDREN_GUIDS, DOMAIN
+from tests.conftest import build_config_entry
+
+# Captured once at import; the template's events are anchored to this day
+_NOW = dt_util.now()
+
+# Ten attendees, enough to trigger the "and N more" truncation
+_MANY_ATTENDEES = tuple(f"Teacher {i}" for i in range(10))
+
+# Coordinator data shared by the module, deep-copied into each mock_coordinator
+_COORDINATOR_DATA_TEMPLATE = {
+    "user_info": {
+        "username": "john.doe",
+        "fullname": "John Doe",
+        "email": "john.doe@test.com",
+        "role": "student",
+        "guid": "test-user-123",
+    },
+    "children_guids": ["test-child-123", "test-child-456"],
+    "children_data": {
+        "test-child-123": {
+            "name": "John Doe",
+            "events": {
+                "week": [
+                    {
+                        "start": _NOW.replace(hour=9, minute=0, second=0, microsecond=0),
+                        "end": _NOW.replace(hour=10, minute=0, second=0, microsecond=0),
+                        "subject": "Mathematics",
+                        "location": "Room 101",
+                        "description": "Algebra lesson",
+                        "guild": "Year 10",
+                        "attendees": ["Mr. Smith"],
+                    },
+                    {
+                        "start": _NOW.replace(hour=11, minute=0, second=0, microsecond=0) + timedelta(days=1),
+                        "end": _NOW.replace(hour=12, minute=0, second=0, microsecond=0) + timedelta(days=1),
+                        "subject": "Science",
+                        "location": "Lab 1",
+                        "description": "Chemistry experiment",
+                        "guild": "Year 10",
+                        "attendees": ["Ms. Johnson"],
+                    },
+                ]
+            },
+            "tasks": {
+                "all": [],
+                "due_today": [],
+                "upcoming": [],
+                "overdue": [],
+            },
+        },
+        "test-child-456": {
+            "name": "Jane Doe",
+            "events": {"week": []},
+            "tasks": {
+                "all": [],
+                "due_today": [],
+                "upcoming": [],
+                "overdue": [],
+            },
+        },
+    },
+    "last_updated": _NOW,
+}
+
+
+@pytest.fixture(scope="module")
+def frozen_now():
+    """Return the module's fixed "now", the same instant the coordinator template is anchored to."""
+    return _NOW
 
 
 @pytest.fixture
-def mock_coordinator():
-    """Return a mock coordinator with calendar data."""
-    coordinator = MagicMock()
-    now = dt_util.now()
+def calendar(mock_coordinator, mock_config_entry):
+    """Return the calendar entity for test-child-123."""
+    return FireflyCalendar(mock_coordinator, mock_config_entry, "test-child-123")
 
-    # Mock coordinator data
-    coordinator.data = {
-        "user_info": {
-            "username": "john.doe",
-            "fullname": "John Doe",
-            "email": "john.doe@test.com",
-            "role": "student",
-            "guid": "test-user-123",
-        },
-        "children_guids": ["test-child-123", "test-child-456"],
-        "children_data": {
-            "test-child-123": {
-                "name": "John Doe",
-                "events": {
-                    "week": [
-                        {
-                            "start": now.replace(hour=9, minute=0, second=0, microsecond=0),
-                            "end": now.replace(hour=10, minute=0, second=0, microsecond=0),
-                            "subject": "Mathematics",
-                            "location": "Room 101",
-                            "description": "Algebra lesson",
-                            "guild": "Year 10",
-                            "attendees": ["Mr. Smith"],
-                        },
-                        {
-                            "start": now.replace(hour=11, minute=0, second=0, microsecond=0) + timedelta(days=1),
-                            "end": now.replace(hour=12, minute=0, second=0, microsecond=0) + timedelta(days=1),
-                            "subject": "Science",
-                            "location": "Lab 1",
-                            "description": "Chemistry experiment",
-                            "guild": "Year 10",
-                            "attendees": ["Ms. Johnson"],
-                        },
-                    ]
-                },
-                "tasks": {
-                    "all": [],
-                    "due_today": [],
-                    "upcoming": [],
-                    "overdue": [],
-                },
-            },
-            "test-child-456": {
-                "name": "Jane Doe",
-                "events": {"week": []},
-                "tasks": {
-                    "all": [],
-                    "due_today": [],
-                    "upcoming": [],
-                    "overdue": [],
-                },
-            },
-        },
-        "last_updated": now,
-    }
 
+@pytest.fixture
+def mock_coordinator():
+    """Return a mock coordinator with a private copy of the calendar data."""
+    coordinator = MagicMock(spec=DataUpdateCoordinator)
+    coordinator.data = copy.deepcopy(_COORDINATOR_DATA_TEMPLATE)
     coordinator.last_update_success = True
     coordinator.last_exception = None
     return coordinator
 
 
-@pytest.mark.asyncio
 async def test_async_setup_entry(hass: HomeAssistant, mock_config_entry, mock_coordinator):
     """Test calendar platform setup."""
     hass.data[DOMAIN] = {mock_config_entry.entry_id: mock_coordinator}
@@ -108,21 +117,15 @@ async def test_async_setup_entry(hass: HomeAssistant, mock_config_entry, mock_co
     assert all(isinstance(e, FireflyCalendar) for e in entities)
 
 
-@pytest.mark.asyncio
-async def test_calendar_properties(mock_coordinator, mock_config_entry):
+def test_calendar_properties(calendar, mock_config_entry):
     """Test calendar basic properties."""
-    calendar = FireflyCalendar(mock_coordinator, mock_config_entry, "test-child-123")
-
     assert "Schedule" in calendar.name
     assert calendar.unique_id == f"{mock_config_entry.entry_id}_calendar_test-child-123"
     assert calendar.icon == "mdi:calendar-month"
 
 
-@pytest.mark.asyncio
-async def test_calendar_availability(mock_coordinator, mock_config_entry):
+def test_calendar_availability(calendar, mock_coordinator):
     """Test calendar availability."""
-    calendar = FireflyCalendar(mock_coordinator, mock_config_entry, "test-child-123")
-
     # Available when coordinator has successful update and child data exists
     mock_coordinator.last_update_success = True
     mock_coordinator.data = {"children_data": {"test-child-123": {"some": "data"}}}
@@ -138,58 +141,37 @@ async def test_calendar_availability(mock_coordinator, mock_config_entry):
     assert calendar.available is False
 
 
-@pytest.mark.asyncio
-async def test_calendar_current_event(mock_coordinator, mock_config_entry):
-    """Test calendar current event property."""
-    calendar = FireflyCalendar(mock_coordinator, mock_config_entry, "test-child-123")
-
-    # Mock current time to be during first event
-    now = dt_util.now()
-    mock_coordinator.data["children_data"]["test-child-123"]["events"]["week"][0]["start"] = now - timedelta(minutes=30)
-    mock_coordinator.data["children_data"]["test-child-123"]["events"]["week"][0]["end"] = now + timedelta(minutes=30)
-
-    event = calendar.event
-    assert event is not None
-    assert isinstance(event, CalendarEvent)
-    assert event.summary == "Mathematics"
-    assert event.location == "Room 101"
-
-
-@pytest.mark.asyncio
-async def test_calendar_next_event(mock_coordinator, mock_config_entry):
-    """Test calendar next event when no current event."""
-    calendar = FireflyCalendar(mock_coordinator, mock_config_entry, "test-child-123")
-
-    # Mock both events to be in the future
-    now = dt_util.now()
-    mock_coordinator.data["children_data"]["test-child-123"]["events"]["week"][0]["start"] = now + timedelta(hours=1)
-    mock_coordinator.data["children_data"]["test-child-123"]["events"]["week"][0]["end"] = now + timedelta(hours=2)
-
-    event = calendar.event
-    assert event is not None
-    assert isinstance(event, CalendarEvent)
-    assert event.summary == "Mathematics"
-
-
-@pytest.mark.asyncio
-async def test_calendar_no_events(mock_coordinator, mock_config_entry):
-    """Test calendar with no events."""
-    calendar = FireflyCalendar(mock_coordinator, mock_config_entry, "test-child-123")
-
-    # Clear events
-    mock_coordinator.data["children_data"]["test-child-123"]["events"]["week"] = []
+@pytest.mark.parametrize(
+    "start_delta,end_delta,expected_summary",
+    [
+        (timedelta(minutes=-30), timedelta(minutes=30), "Mathematics"),  # current event
+        (timedelta(hours=1), timedelta(hours=2), "Mathematics"),  # next event
+        (None, None, None),  # no events
+    ],
+    ids=["current", "next", "none"],
+)
+def test_calendar_event(calendar, mock_coordinator, start_delta, end_delta, expected_summary):
+    """Test calendar event picks the current event, else the next one, else None."""
+    week = mock_coordinator.data["children_data"]["test-child-123"]["events"]["week"]
+    if start_delta is None:
+        week.clear()
+    else:
+        now = dt_util.now()
+        week[0]["start"] = now + start_delta
+        week[0]["end"] = now + end_delta
 
     event = calendar.event
-    assert event is None
+    if expected_summary is None:
+        assert event is None
+    else:
+        assert isinstance(event, CalendarEvent)
+        assert event.summary == expected_summary
+        assert event.location == "Room 101"
 
 
-@pytest.mark.asyncio
-async def test_calendar_get_events(hass, mock_coordinator, mock_config_entry):
+async def test_calendar_get_events(hass, calendar, frozen_now):
     """Test calendar get_events method."""
-    calendar = FireflyCalendar(mock_coordinator, mock_config_entry, "test-child-123")
-
-    now = dt_util.now()
-    start_date = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    start_date = frozen_now.replace(hour=0, minute=0, second=0, microsecond=0)
     end_date = start_date + timedelta(days=7)
 
     events = await calendar.async_get_events(hass, start_date, end_date)
@@ -200,19 +182,15 @@ async def test_calendar_get_events(hass, mock_coordinator, mock_config_entry):
     assert events[1].summary == "Science"
 
 
-@pytest.mark.asyncio
-async def test_calendar_get_events_filtered_by_date(hass, mock_coordinator, mock_config_entry):
+async def test_calendar_get_events_filtered_by_date(hass, calendar, mock_coordinator, frozen_now):
     """Test calendar get_events with date filtering."""
-    calendar = FireflyCalendar(mock_coordinator, mock_config_entry, "test-child-123")
-
-    now = dt_util.now()
     # Only request today's events
-    start_date = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    start_date = frozen_now.replace(hour=0, minute=0, second=0, microsecond=0)
     end_date = start_date + timedelta(days=1)
 
     # Mock first event to be today, second to be tomorrow
-    mock_coordinator.data["children_data"]["test-child-123"]["events"]["week"][0]["start"] = now.replace(hour=9)
-    mock_coordinator.data["children_data"]["test-child-123"]["events"]["week"][0]["end"] = now.replace(hour=10)
+    mock_coordinator.data["children_data"]["test-child-123"]["events"]["week"][0]["start"] = frozen_now.replace(hour=9)
+    mock_coordinator.data["children_data"]["test-child-123"]["events"]["week"][0]["end"] = frozen_now.replace(hour=10)
     events = await calendar.async_get_events(hass, start_date, end_date)
 
     # Should only return today's event
@@ -220,11 +198,8 @@ async def test_calendar_get_events_filtered_by_date(hass, mock_coordinator, mock
     assert events[0].summary == "Mathematics"
 
 
-@pytest.mark.asyncio
-async def test_calendar_convert_event_with_description(mock_coordinator, mock_config_entry):
+def test_calendar_convert_event_with_description(calendar, mock_coordinator):
     """Test calendar event conversion with full event data."""
-    calendar = FireflyCalendar(mock_coordinator, mock_config_entry, "test-child-123")
-
     # Get first event from coordinator data
     event_data = mock_coordinator.data["children_data"]["test-child-123"]["events"]["week"][0]
     calendar_event = calendar._convert_to_calendar_event(event_data)
@@ -237,11 +212,8 @@ async def test_calendar_convert_event_with_description(mock_coordinator, mock_co
     assert calendar_event.description and "Attendees: Mr. Smith" in calendar_event.description
 
 
-@pytest.mark.asyncio
-async def test_calendar_device_info(mock_coordinator, mock_config_entry):
+def test_calendar_device_info(calendar, mock_config_entry):
     """Test calendar device info."""
-    calendar = FireflyCalendar(mock_coordinator, mock_config_entry, "test-child-123")
-
     device_info = calendar.device_info
     assert device_info is not None
     assert device_info.get("identifiers") == {(DOMAIN, mock_config_entry.entry_id)}
@@ -250,10 +222,9 @@ async def test_calendar_device_info(mock_coordinator, mock_config_entry):
     assert device_info.get("model") == "Firefly Cloud Integration"
 
 
-@pytest.mark.asyncio
-async def test_calendar_name_includes_child_name(mock_config_entry):
+def test_calendar_name_includes_child_name(mock_config_entry):
     """Test calendar name includes child name when available."""
-    coordinator = MagicMock()
+    coordinator = MagicMock(spec=DataUpdateCoordinator)
     coordinator.last_update_success = True
     coordinator.data = {
         "children_data": {
@@ -271,10 +242,9 @@ async def test_calendar_name_includes_child_name(mock_config_entry):
     assert "Schedule" in calendar.name
 
 
-@pytest.mark.asyncio
-async def test_calendar_name_fallback_to_guid(mock_config_entry):
+def test_calendar_name_fallback_to_guid(mock_config_entry):
     """Test calendar name falls back to GUID when no name available."""
-    coordinator = MagicMock()
+    coordinator = MagicMock(spec=DataUpdateCoordinator)
     coordinator.last_update_success = True
     coordinator.data = {
         "children_data": {
@@ -291,31 +261,17 @@ async def test_calendar_name_fallback_to_guid(mock_config_entry):
     assert "Schedule" in calendar.name
 
 
-@pytest.mark.asyncio
 async def test_calendar_multiple_children_setup(hass: HomeAssistant):
     """Test calendar setup with multiple children."""
     # Create config entry with 2 children
-    config_entry = create_config_entry_with_version_compat(
-        version=1,
-        minor_version=1,
-        domain=DOMAIN,
+    config_entry = build_config_entry(
         title="Test School - Multiple Children",
-        data={
-            CONF_SCHOOL_NAME: "Test School",
-            CONF_HOST: "https://testschool.fireflycloud.net",
-            CONF_DEVICE_ID: "test-device-123",
-            CONF_SECRET: "test-secret-456",
-            CONF_USER_GUID: "test-user-789",
-            CONF_CHILDREN_GUIDS: ["child-1", "child-2"],
-        },
-        options={},
+        data={CONF_CHILDREN_GUIDS: ["child-1", "child-2"]},
         entry_id="test-entry-multiple-children",
         unique_id="test-unique-id-multiple-children",
-        source="user",
-        discovery_keys=MappingProxyType({}),
     )
 
-    coordinator = MagicMock()
+    coordinator = MagicMock(spec=DataUpdateCoordinator)
     coordinator.data = {
         "user_info": {"username": "parent", "fullname": "Parent User"},
         "children_guids": ["child-1", "child-2"],
@@ -351,15 +307,12 @@ async def test_calendar_multiple_children_setup(hass: HomeAssistant):
     assert "child-2" in child_guids
 
 
-@pytest.mark.asyncio
-async def test_calendar_event_build_description_empty_fields(mock_coordinator, mock_config_entry):
+def test_calendar_event_build_description_empty_fields(calendar, frozen_now):
     """Test calendar event description building with empty optional fields."""
-    calendar = FireflyCalendar(mock_coordinator, mock_config_entry, "test-child-123")
-
     # Event with minimal data
     event_data = {
-        "start": dt_util.now(),
-        "end": dt_util.now() + timedelta(hours=1),
+        "start": frozen_now,
+        "end": frozen_now + timedelta(hours=1),
         "subject": "Test Subject",
         "location": "Test Location",
         "description": None,
@@ -375,20 +328,17 @@ async def test_calendar_event_build_description_empty_fields(mock_coordinator, m
     assert calendar_event.description is None
 
 
-@pytest.mark.asyncio
-async def test_calendar_event_build_description_with_many_attendees(mock_coordinator, mock_config_entry):
+def test_calendar_event_build_description_with_many_attendees(calendar, frozen_now):
     """Test calendar event description with many attendees (truncation)."""
-    calendar = FireflyCalendar(mock_coordinator, mock_config_entry, "test-child-123")
-
     # Event with many attendees
     event_data = {
-        "start": dt_util.now(),
-        "end": dt_util.now() + timedelta(hours=1),
+        "start": frozen_now,
+        "end": frozen_now + timedelta(hours=1),
         "subject": "Test Subject",
         "location": "Test Location",
         "description": "Test description",
         "guild": "Year 10",
-        "attendees": [f"Teacher {i}" for i in range(10)],  # 10 attendees
+        "attendees": _MANY_ATTENDEES,
     }
 
     calendar_event = calendar._convert_to_calendar_event(event_data)
@@ -398,15 +348,12 @@ async def test_calendar_event_build_description_with_many_attendees(mock_coordin
     assert calendar_event.description and "and 5 more" in calendar_event.description  # Should truncate after first 5
 
 
-@pytest.mark.asyncio
-async def test_calendar_event_build_description_with_dict_attendees(mock_coordinator, mock_config_entry):
+def test_calendar_event_build_description_with_dict_attendees(calendar, frozen_now):
     """Test calendar event description with dictionary attendees (real API format)."""
-    calendar = FireflyCalendar(mock_coordinator, mock_config_entry, "test-child-123")
-
     # Event with dictionary attendees (how they come from the real API)
     event_data = {
-        "start": dt_util.now(),
-        "end": dt_util.now() + timedelta(hours=1),
+        "start": frozen_now,
+        "end": frozen_now + timedelta(hours=1),
         "subject": "Chemistry Lab",
         "location": "Science Lab 1",
         "description": "Bring safety goggles",
@@ -427,10 +374,9 @@ async def test_calendar_event_build_description_with_dict_attendees(mock_coordin
     assert calendar_event.description and "Attendees: Dr. Smith, Ms. Johnson, Mr. Brown" in calendar_event.description
 
 
-@pytest.mark.asyncio
-async def test_calendar_no_coordinator_data(hass, mock_config_entry):
+async def test_calendar_no_coordinator_data(hass, mock_config_entry, frozen_now):
     """Test calendar with no coordinator data."""
-    coordinator = MagicMock()
+    coordinator = MagicMock(spec=DataUpdateCoordinator)
     coordinator.data = None
     coordinator.last_update_success = False
 
@@ -440,28 +386,25 @@ async def test_calendar_no_coordinator_data(hass, mock_config_entry):
     assert calendar.event is None
 
     # Should handle get_events gracefully
-    events = await calendar.async_get_events(hass, dt_util.now(), dt_util.now() + timedelta(days=1))
+    events = await calendar.async_get_events(hass, frozen_now, frozen_now + timedelta(days=1))
     assert events == []
 
 
-@pytest.mark.asyncio
-async def test_calendar_get_events_no_data(hass, mock_config_entry):
+async def test_calendar_get_events_no_data(hass, mock_config_entry, frozen_now):
     """Test calendar get_events with no coordinator data."""
-    coordinator = MagicMock()
+    coordinator = MagicMock(spec=DataUpdateCoordinator)
     coordinator.data = None
 
     calendar = FireflyCalendar(coordinator, mock_config_entry, "test-child-123")
 
-    now = dt_util.now()
-    events = await calendar.async_get_events(hass, now, now + timedelta(days=1))
+    events = await calendar.async_get_events(hass, frozen_now, frozen_now + timedelta(days=1))
 
     assert events == []
 
 
-@pytest.mark.asyncio
-async def test_calendar_handles_missing_child_data_gracefully(hass, mock_config_entry):
+async def test_calendar_handles_missing_child_data_gracefully(hass, mock_config_entry, frozen_now):
     """Test calendar handles missing child data gracefully."""
-    coordinator = MagicMock()
+    coordinator = MagicMock(spec=DataUpdateCoordinator)
     coordinator.last_update_success = True
     coordinator.data = {
         "user_info": {"username": "test", "fullname": "Test User", "guid": "test-123"},
@@ -475,16 +418,14 @@ async def test_calendar_handles_missing_child_data_gracefully(hass, mock_config_
     assert calendar.event is None
 
     # get_events should return empty list
-    now = dt_util.now()
-    events = await calendar.async_get_events(hass, now, now + timedelta(days=1))
+    events = await calendar.async_get_events(hass, frozen_now, frozen_now + timedelta(days=1))
     assert events == []
 
 
-@pytest.mark.asyncio
-async def test_calendar_convert_event_missing_start_time(hass, mock_config_entry):
+def test_calendar_convert_event_missing_start_time(mock_config_entry):
     """Test calendar convert_event with missing start time."""
 
-    coordinator = MagicMock()
+    coordinator = MagicMock(spec=DataUpdateCoordinator)
     calendar = FireflyCalendar(coordinator, mock_config_entry, "test-child-123")
 
     # Event missing start time
@@ -498,11 +439,10 @@ async def test_calendar_convert_event_missing_start_time(hass, mock_config_entry
         calendar._convert_to_calendar_event(incomplete_event)
 
 
-@pytest.mark.asyncio
-async def test_calendar_convert_event_missing_end_time(hass, mock_config_entry):
+def test_calendar_convert_event_missing_end_time(mock_config_entry):
     """Test calendar convert_event with missing end time."""
 
-    coordinator = MagicMock()
+    coordinator = MagicMock(spec=DataUpdateCoordinator)
     calendar = FireflyCalendar(coordinator, mock_config_entry, "test-child-123")
 
     # Event missing end time
@@ -512,10 +452,9 @@ async def test_calendar_convert_event_missing_end_time(hass, mock_config_entry):
         calendar._convert_to_calendar_event(incomplete_event)
 
 
-@pytest.mark.asyncio
-async def test_calendar_get_events_no_week_events_data(hass, mock_config_entry):
+async def test_calendar_get_events_no_week_events_data(hass, mock_config_entry, frozen_now):
     """Test calendar get_events when week events data is missing."""
-    coordinator = MagicMock()
+    coordinator = MagicMock(spec=DataUpdateCoordinator)
     coordinator.data = {
         "children_data": {
             "test-child-123": {
@@ -530,19 +469,17 @@ async def test_calendar_get_events_no_week_events_data(hass, mock_config_entry):
 
     calendar = FireflyCalendar(coordinator, mock_config_entry, "test-child-123")
 
-    now = dt_util.now()
-    events = await calendar.async_get_events(hass, now, now + timedelta(days=7))
+    events = await calendar.async_get_events(hass, frozen_now, frozen_now + timedelta(days=7))
 
     # Should handle missing week data gracefully
     assert events == []
 
 
-@pytest.mark.asyncio
-async def test_calendar_current_event_with_multiple_overlapping(hass, mock_config_entry):
+def test_calendar_current_event_with_multiple_overlapping(mock_config_entry):
     """Test calendar current event selection with multiple overlapping events."""
     now = dt_util.now()
 
-    coordinator = MagicMock()
+    coordinator = MagicMock(spec=DataUpdateCoordinator)
     coordinator.data = {
         "children_data": {
             "test-child-123": {
@@ -582,10 +519,9 @@ async def test_calendar_current_event_with_multiple_overlapping(hass, mock_confi
     assert current_event.summary == "Math Class"
 
 
-@pytest.mark.asyncio
-async def test_calendar_build_description_none_values(hass, mock_config_entry):
+def test_calendar_build_description_none_values(mock_config_entry):
     """Test calendar build_description with None values."""
-    coordinator = MagicMock()
+    coordinator = MagicMock(spec=DataUpdateCoordinator)
     calendar = FireflyCalendar(coordinator, mock_config_entry, "test-child-123")
 
     event_data = {"description": None, "location": None, "attendees": None, "guild": None}
@@ -596,7 +532,6 @@ async def test_calendar_build_description_none_values(hass, mock_config_entry):
     assert description is None
 
 
-@pytest.mark.asyncio
 async def test_calendar_async_added_to_hass(hass, mock_coordinator, mock_config_entry):
     """Test calendar entity lifecycle when added to hass."""
     from unittest.mock import MagicMock
@@ -616,7 +551,6 @@ async def test_calendar_async_added_to_hass(hass, mock_coordinator, mock_config_
     assert calendar._unsub_coordinator is not None
 
 
-@pytest.mark.asyncio
 async def test_calendar_async_will_remove_from_hass(hass, mock_coordinator, mock_config_entry):
     """Test calendar entity lifecycle when removed from hass."""
     from unittest.mock import MagicMock
@@ -636,7 +570,6 @@ async def test_calendar_async_will_remove_from_hass(hass, mock_coordinator, mock
     assert mock_unsub.called
 
 
-@pytest.mark.asyncio
 async def test_calendar_async_will_remove_from_hass_no_unsub(hass, mock_coordinator, mock_config_entry):
     """Test calendar entity removal when no unsub function exists."""
     calendar = FireflyCalendar(
@@ -1,13 +1,17 @@
 """Test the Firefly Cloud config flow."""
 
+from contextlib import contextmanager
 from types import MappingProxyType
-from unittest.mock import patch
+from unittest.mock import AsyncMock, patch
 
 import pytest
+import pytest_asyncio
+from conftest import add_to_hass, build_config_entry
 from homeassistant import config_entries
 from homeassistant.core import HomeAssistant
 from homeassistant.data_entry_flow import FlowResultType
 
+from custom_components.firefly_cloud import config_flow
 from custom_components.firefly_cloud.const import DOMAIN
 from custom_components.firefly_cloud.exceptions import (
     FireflyAuthenticationError,
@@ -15,44 +19,110 @@ from custom_components.firefly_cloud.exceptions import (
     FireflySchoolNotFoundError,
 )
 
+# School lookup result for "testschool"
+_SCHOOL_INFO = MappingProxyType(
+    {
+        "enabled": True,
+        "name": "Test School",
+        "host": "testschool.fireflycloud.net",
+        "url": "https://testschool.fireflycloud.net",
+        "device_id": "test-device-123",
+    }
+)
+
+
+# Student account returned by get_user_info
+_USER_INFO = MappingProxyType(
+    {
+        "username": "john.doe",
+        "fullname": "John Doe",
+        "email": "john.doe@test.com",
+        "role": "student",
+        "guid": "test-guid",
+    }
+)
+
+# Parsed authentication response for the student account
+_AUTH_RESPONSE = MappingProxyType({"secret": "test-secret", "user": _USER_INFO})
+
+
+# Shared side-effect exceptions; mock re-raises the same instance each time
+_SCHOOL_NOT_FOUND = FireflySchoolNotFoundError("School not found")
+_CONNECTION_ERROR = FireflyConnectionError("Connection failed")
+_AUTH_ERROR = FireflyAuthenticationError("Invalid response")
+_UNEXPECTED_ERROR = RuntimeError("Unexpected error")
+
+
+@contextmanager
+def patch_firefly_api(**overrides):
+    """Replace the config flow's FireflyAPIClient with an autospec mock for one successful student login.
+
+    Each keyword replaces the default mock for that method, e.g.
+    ``verify_credentials=AsyncMock(return_value=False)``. Yields the mocked client instance;
+    get_school_info is a classmethod, so it lives on the mocked class.
+    """
+    with patch.object(config_flow, "FireflyAPIClient", autospec=True) as client_cls:
+        client_cls.get_school_info = overrides.pop("get_school_info", AsyncMock(return_value=dict(_SCHOOL_INFO)))
+        client = client_cls.return_value
+        client.get_auth_url.return_value = "https://testschool.fireflycloud.net/login/login.aspx"
+        methods = {
+            "parse_authentication_response": AsyncMock(return_value=_AUTH_RESPONSE),
+            "verify_credentials": AsyncMock(return_value=True),
+            "get_user_info": AsyncMock(return_value=_USER_INFO),
+            "get_children_info": AsyncMock(return_value=[_USER_INFO]),  # A student is their own only child
+            **overrides,
+        }
+        for name, mock in methods.items():
+            setattr(client, name, mock)
+        yield client
+
+
+async def _init_user_flow(hass: HomeAssistant):
+    """Start a config flow from the user step and return its first result."""
+    return await hass.config_entries.flow.async_init(DOMAIN, context={"source": config_entries.SOURCE_USER})
+
 
 @pytest.fixture
+def mock_firefly_client():
+    """Patch FireflyAPIClient for the whole test and return the mocked client instance flows will use."""
+    with patch_firefly_api() as client:
+        yield client
+
+
+@pytest_asyncio.fixture
+async def auth_flow_id(hass: HomeAssistant, mock_firefly_client):  # pylint: disable=unused-argument
+    """Start a user flow, submit the school code and return the flow id waiting at the auth step."""
+    result = await _init_user_flow(hass)
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"],
+        {"school_code": "testschool"},
+    )
+
+    assert result["step_id"] == "auth"
+    return result["flow_id"]
+
+
+@pytest.fixture(autouse=True)
 def mock_setup_entry():
-    """Mock setting up config entry."""
-    with patch("custom_components.firefly_cloud.async_setup_entry", return_value=True) as mock_setup:
+    """Keep the real async_setup_entry from running when a flow creates an entry."""
+    with patch("custom_components.firefly_cloud.async_setup_entry", new=AsyncMock(return_value=True)) as mock_setup:
         yield mock_setup
 
 
-@pytest.mark.asyncio
-async def test_form_user_flow(hass: HomeAssistant, mock_setup_entry) -> None:  # pylint: disable=unused-argument
+async def test_form_user_flow(hass: HomeAssistant) -> None:
     """Test we get the form for user flow."""
-    result = await hass.config_entries.flow.async_init(DOMAIN, context={"source": config_entries.SOURCE_USER})
+    result = await _init_user_flow(hass)
 
     assert result["type"] == FlowResultType.FORM
     assert result["errors"] == {}
     assert result["step_id"] == "user"
 
 
-@pytest.mark.asyncio
-async def test_form_user_flow_success(hass: HomeAssistant, mock_setup_entry) -> None:  # pylint: disable=unused-argument
+async def test_form_user_flow_success(hass: HomeAssistant) -> None:
     """Test successful user flow."""
-    result = await hass.config_entries.flow.async_init(DOMAIN, context={"source": config_entries.SOURCE_USER})
-
-    mock_school_info = {
-        "enabled": True,
-        "name": "Test School",
-        "host": "testschool.fireflycloud.net",
-        "url": "https://testschool.fireflycloud.net",
-        "device_id": "test-device-123",
-    }
+    result = await _init_user_flow(hass)
 
-    with (
-        patch(
-            "custom_components.firefly_cloud.config_flow.FireflyAPIClient.get_school_info",
-            return_value=mock_school_info,
-        ),
-        patch("homeassistant.helpers.aiohttp_client.async_get_clientsession"),
-    ):
+    with patch_firefly_api():
         result2 = await hass.config_entries.flow.async_configure(
             result["flow_id"],
             {"school_code": "testschool"},
@@ -62,40 +132,19 @@ async def test_form_user_flow_success(hass: HomeAssistant, mock_setup_entry) ->
     assert result2["step_id"] == "auth"
 
 
-@pytest.mark.asyncio
-async def test_form_school_not_found(hass: HomeAssistant) -> None:
-    """Test school not found error."""
-    result = await hass.config_entries.flow.async_init(DOMAIN, context={"source": config_entries.SOURCE_USER})
-
-    with (
-        patch(
-            "custom_components.firefly_cloud.config_flow.FireflyAPIClient.get_school_info",
-            side_effect=FireflySchoolNotFoundError("School not found"),
-        ),
-        patch("homeassistant.helpers.aiohttp_client.async_get_clientsession"),
-    ):
-        result2 = await hass.config_entries.flow.async_configure(
-            result["flow_id"],
-            {"school_code": "invalid"},
-        )
-
-    assert result2["type"] == FlowResultType.FORM
-    assert result2["step_id"] == "user"
-    assert result2["errors"] == {"base": "school_not_found"}
-
-
-@pytest.mark.asyncio
-async def test_form_connection_error(hass: HomeAssistant) -> None:
-    """Test connection error."""
-    result = await hass.config_entries.flow.async_init(DOMAIN, context={"source": config_entries.SOURCE_USER})
+@pytest.mark.parametrize(
+    "exc,error",
+    [
+        (_SCHOOL_NOT_FOUND, "school_not_found"),
+        (_CONNECTION_ERROR, "cannot_connect"),
+        (_UNEXPECTED_ERROR, "unknown"),
+    ],
+)
+async def test_user_step_errors(hass: HomeAssistant, exc, error) -> None:
+    """Test the user step maps school lookup failures to form errors."""
+    result = await _init_user_flow(hass)
 
-    with (
-        patch(
-            "custom_components.firefly_cloud.config_flow.FireflyAPIClient.get_school_info",
-            side_effect=FireflyConnectionError("Connection failed"),
-        ),
-        patch("homeassistant.helpers.aiohttp_client.async_get_clientsession"),
-    ):
+    with patch_firefly_api(get_school_info=AsyncMock(side_effect=exc)):
         result2 = await hass.config_entries.flow.async_configure(
             result["flow_id"],
             {"school_code": "testschool"},
@@ -103,77 +152,15 @@ async def test_form_connection_error(hass: HomeAssistant) -> None:
 
     assert result2["type"] == FlowResultType.FORM
     assert result2["step_id"] == "user"
-    assert result2["errors"] == {"base": "cannot_connect"}
+    assert result2["errors"] == {"base": error}
 
 
-@pytest.mark.asyncio
-async def test_form_auth_step_success(hass: HomeAssistant, mock_setup_entry) -> None:  # pylint: disable=unused-argument
+async def test_form_auth_step_success(hass: HomeAssistant, auth_flow_id) -> None:
     """Test successful authentication step."""
-    # Start flow and get to auth step
-    result = await hass.config_entries.flow.async_init(DOMAIN, context={"source": config_entries.SOURCE_USER})
-
-    mock_school_info = {
-        "enabled": True,
-        "name": "Test School",
-        "host": "testschool.fireflycloud.net",
-        "url": "https://testschool.fireflycloud.net",
-        "device_id": "test-device-123",
-    }
-
-    with (
-        patch(
-            "custom_components.firefly_cloud.config_flow.FireflyAPIClient.get_school_info",
-            return_value=mock_school_info,
-        ),
-        patch("homeassistant.helpers.aiohttp_client.async_get_clientsession"),
-    ):
-        result = await hass.config_entries.flow.async_configure(
-            result["flow_id"],
-            {"school_code": "testschool"},
-        )
-
-    # Mock authentication response
-    mock_auth_response = {
-        "secret": "test-secret",
-        "user": {
-            "username": "john.doe",
-            "fullname": "John Doe",
-            "email": "john.doe@test.com",
-            "role": "student",
-            "guid": "test-guid",
-        },
-    }
-
-    mock_user_info = {
-        "username": "john.doe",
-        "fullname": "John Doe",
-        "email": "john.doe@test.com",
-        "role": "student",
-        "guid": "test-guid",
-    }
-
-    with (
-        patch(
-            "custom_components.firefly_cloud.config_flow.FireflyAPIClient.parse_authentication_response",
-            return_value=mock_auth_response,
-        ),
-        patch(
-            "custom_components.firefly_cloud.config_flow.FireflyAPIClient.verify_credentials",
-            return_value=True,
-        ),
-        patch(
-            "custom_components.firefly_cloud.config_flow.FireflyAPIClient.get_user_info",
-            return_value=mock_user_info,
-        ),
-        patch(
-            "custom_components.firefly_cloud.config_flow.FireflyAPIClient.get_children_info",
-            return_value=[mock_user_info],  # Student returns themselves as only child
-        ),
-    ):
-        result2 = await hass.config_entries.flow.async_configure(
-            result["flow_id"],
-            {"auth_response": "mock_auth_response"},
-        )
+    result2 = await hass.config_entries.flow.async_configure(
+        auth_flow_id,
+        {"auth_response": "mock_auth_response"},
+    )
 
     assert result2["type"] == FlowResultType.CREATE_ENTRY
     assert result2["title"] == "Test School - John Doe"
@@ -181,109 +168,48 @@ async def test_form_auth_step_success(hass: HomeAssistant, mock_setup_entry) ->
     assert result2["data"]["secret"] == "test-secret"
 
 
-@pytest.mark.asyncio
-async def test_form_auth_invalid_response(hass: HomeAssistant) -> None:
-    """Test invalid authentication response."""
-    # Start flow and get to auth step
-    result = await hass.config_entries.flow.async_init(DOMAIN, context={"source": config_entries.SOURCE_USER})
-
-    mock_school_info = {
-        "enabled": True,
-        "name": "Test School",
-        "host": "testschool.fireflycloud.net",
-        "url": "https://testschool.fireflycloud.net",
-        "device_id": "test-device-123",
-    }
-
-    with (
-        patch(
-            "custom_components.firefly_cloud.config_flow.FireflyAPIClient.get_school_info",
-            return_value=mock_school_info,
-        ),
-        patch("homeassistant.helpers.aiohttp_client.async_get_clientsession"),
-    ):
-        result = await hass.config_entries.flow.async_configure(
-            result["flow_id"],
-            {"school_code": "testschool"},
-        )
+@pytest.mark.parametrize(
+    "method,exc,error",
+    [
+        ("parse_authentication_response", _AUTH_ERROR, "invalid_auth"),
+        ("get_children_info", _CONNECTION_ERROR, "cannot_connect"),
+        ("parse_authentication_response", _UNEXPECTED_ERROR, "unknown"),
+    ],
+)
+async def test_auth_step_errors(hass: HomeAssistant, auth_flow_id, mock_firefly_client, method, exc, error) -> None:
+    """Test the auth step maps client failures to form errors."""
+    getattr(mock_firefly_client, method).side_effect = exc
 
-    # Test invalid auth response
-    with patch(
-        "custom_components.firefly_cloud.config_flow.FireflyAPIClient.parse_authentication_response",
-        side_effect=FireflyAuthenticationError("Invalid response"),
-    ):
-        result2 = await hass.config_entries.flow.async_configure(
-            result["flow_id"],
-            {"auth_response": "invalid_response"},
-        )
+    result2 = await hass.config_entries.flow.async_configure(
+        auth_flow_id,
+        {"auth_response": "mock_auth_response"},
+    )
 
     assert result2["type"] == FlowResultType.FORM
     assert result2["step_id"] == "auth"
-    assert result2["errors"] == {"base": "invalid_auth"}
+    assert result2["errors"] == {"base": error}
 
 
-@pytest.mark.asyncio
-async def test_form_auth_credentials_verification_failed(hass: HomeAssistant) -> None:
+async def test_form_auth_credentials_verification_failed(
+    hass: HomeAssistant, auth_flow_id, mock_firefly_client
+) -> None:
     """Test credentials verification failure."""
-    # Start flow and get to auth step
-    result = await hass.config_entries.flow.async_init(DOMAIN, context={"source": config_entries.SOURCE_USER})
-
-    mock_school_info = {
-        "enabled": True,
-        "name": "Test School",
-        "host": "testschool.fireflycloud.net",
-        "url": "https://testschool.fireflycloud.net",
-        "device_id": "test-device-123",
-    }
-
-    with (
-        patch(
-            "custom_components.firefly_cloud.config_flow.FireflyAPIClient.get_school_info",
-            return_value=mock_school_info,
-        ),
-        patch("homeassistant.helpers.aiohttp_client.async_get_clientsession"),
-    ):
-        result = await hass.config_entries.flow.async_configure(
-            result["flow_id"],
-            {"school_code": "testschool"},
-        )
-
     # Mock authentication response but failed verification
-    mock_auth_response = {
-        "secret": "test-secret",
-        "user": {
-            "username": "john.doe",
-            "fullname": "John Doe",
-            "email": "john.doe@test.com",
-            "role": "student",
-            "guid": "test-guid",
-        },
-    }
+    mock_firefly_client.verify_credentials.return_value = False
 
-    with (
-        patch(
-            "custom_components.firefly_cloud.config_flow.FireflyAPIClient.parse_authentication_response",
-            return_value=mock_auth_response,
-        ),
-        patch(
-            "custom_components.firefly_cloud.config_flow.FireflyAPIClient.verify_credentials",
-            return_value=False,
-        ),
-    ):
-        result2 = await hass.config_entries.flow.async_configure(
-            result["flow_id"],
-            {"auth_response": "mock_auth_response"},
-        )
+    result2 = await hass.config_entries.flow.async_configure(
+        auth_flow_id,
+        {"auth_response": "mock_auth_response"},
+    )
 
     assert result2["type"] == FlowResultType.FORM
     assert result2["step_id"] == "auth"
     assert result2["errors"] == {"base": "invalid_auth"}
 
 
-@pytest.mark.asyncio
 async def test_options_flow(hass: HomeAssistant, mock_config_entry) -> None:
     """Test options flow."""
-    hass.config_entries._entries[mock_config_entry.entry_id] = mock_config_entry
+    add_to_hass(hass, mock_config_entry)
 
     result = await hass.config_entries.options.async_init(mock_config_entry.entry_id)
 
@@ -297,89 +223,46 @@ async def test_options_flow(hass: HomeAssistant, mock_config_entry) -> None:
 
     assert result2["type"] == FlowResultType.CREATE_ENTRY
     assert result2["data"]["task_lookahead_days"] == 10
+    assert result2["data"]["partial_recovery"] is False
 
 
-@pytest.mark.asyncio
-async def test_abort_if_already_configured(hass: HomeAssistant) -> None:
-    """Test abort if already configured."""
-    # Create an existing config entry with the same unique_id as the school code we'll test
-    # and add it manually to Home Assistant's registry
-    from conftest import create_config_entry_with_version_compat
-
-    from custom_components.firefly_cloud.const import (
-        CONF_DEVICE_ID,
-        CONF_HOST,
-        CONF_SCHOOL_CODE,
-        CONF_SCHOOL_NAME,
-        CONF_SECRET,
-        CONF_TASK_LOOKAHEAD_DAYS,
-        CONF_USER_GUID,
-        DEFAULT_TASK_LOOKAHEAD_DAYS,
-        DOMAIN,
-    )
+async def test_options_flow_partial_recovery(hass: HomeAssistant, mock_config_entry) -> None:
+    """Test options flow stores partial recovery and offers the saved value next time."""
+    add_to_hass(hass, mock_config_entry)
 
-    existing_entry = create_config_entry_with_version_compat(
-        version=1,
-        minor_version=1,
-        domain=DOMAIN,
-        title="Existing School - John Doe",
-        data={
-            CONF_SCHOOL_CODE: "testschool",
-            CONF_SCHOOL_NAME: "Test School",
-            CONF_HOST: "https://testschool.fireflycloud.net",
-            CONF_DEVICE_ID: "test-device-123",
-            CONF_SECRET: "test-secret-456",
-            CONF_USER_GUID: "test-user-789",
-            CONF_TASK_LOOKAHEAD_DAYS: DEFAULT_TASK_LOOKAHEAD_DAYS,
-        },
-        options={},
-        entry_id="existing-entry-id",
-        unique_id="testschool",
-        source="user",
-        discovery_keys=MappingProxyType({}),
+    result = await hass.config_entries.options.async_init(mock_config_entry.entry_id)
+    result2 = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        user_input={"task_lookahead_days": 7, "partial_recovery": True},
     )
-    # Add to the config entries registry
-    hass.config_entries._entries[existing_entry.entry_id] = existing_entry
 
-    # Also need to ensure the unique_id is properly tracked
-    # Let's trigger the internal indexing by calling the method directly
-    hass.config_entries._async_schedule_save()
+    assert result2["type"] == FlowResultType.CREATE_ENTRY
+    assert result2["data"]["partial_recovery"] is True
 
-    result = await hass.config_entries.flow.async_init(DOMAIN, context={"source": config_entries.SOURCE_USER})
+    result3 = await hass.config_entries.options.async_init(mock_config_entry.entry_id)
+    schema_defaults = {str(key): key.default() for key in result3["data_schema"].schema}
+    assert schema_defaults["partial_recovery"] is True
 
-    # If the flow was already aborted in the init step, result will be the abort
-    if result["type"] == FlowResultType.ABORT:
-        assert result["reason"] == "single_instance_allowed"
-        return
 
-    mock_school_info = {
-        "enabled": True,
-        "name": "Test School",
-        "host": "testschool.fireflycloud.net",
-        "url": "https://testschool.fireflycloud.net",
-        "device_id": "test-device-123",
-    }
+async def test_abort_if_already_configured(hass: HomeAssistant) -> None:
+    """Test abort if already configured."""
+    # Register an existing entry with the same unique_id as the school code we'll test
+    add_to_hass(
+        hass,
+        build_config_entry(title="Existing School - John Doe", entry_id="existing-entry-id", unique_id="testschool"),
+    )
 
-    with patch(
-        "custom_components.firefly_cloud.config_flow.FireflyAPIClient.get_school_info",
-        return_value=mock_school_info,
-    ):
-        result2 = await hass.config_entries.flow.async_configure(
-            result["flow_id"],
-            {"school_code": "testschool"},
-        )
+    # The stubbed integration reports single_config_entry, so the flow aborts before any API call
+    result = await _init_user_flow(hass)
 
-    assert result2["type"] == FlowResultType.ABORT
-    assert result2["reason"] == "single_instance_allowed"
+    assert result["type"] == FlowResultType.ABORT
+    assert result["reason"] == "single_instance_allowed"
 
 
-@pytest.mark.asyncio
-async def test_reauth_flow_success(
-    hass: HomeAssistant, mock_config_entry, mock_setup_entry
-) -> None:  # pylint: disable=unused-argument
+async def test_reauth_flow_success(hass: HomeAssistant, mock_config_entry, mock_firefly_client) -> None:
     """Test successful reauthentication flow."""
     # Add existing entry to hass properly
-    hass.config_entries._entries[mock_config_entry.entry_id] = mock_config_entry
+    add_to_hass(hass, mock_config_entry)
 
     # Start reauth flow
     result = await hass.config_entries.flow.async_init(
@@ -392,28 +275,9 @@ async def test_reauth_flow_success(
     assert result["step_id"] == "reauth_confirm"
 
     # Mock successful authentication
-    mock_auth_response = {
-        "secret": "new-test-secret",
-        "user": {
-            "username": "john.doe",
-            "fullname": "John Doe",
-            "email": "john.doe@test.com",
-            "role": "student",
-            "guid": "test-guid",
-        },
-    }
+    mock_firefly_client.parse_authentication_response.return_value = {**_AUTH_RESPONSE, "secret": "new-test-secret"}
 
-    with (
-        patch(
-            "custom_components.firefly_cloud.config_flow.FireflyAPIClient.parse_authentication_response",
-            return_value=mock_auth_response,
-        ),
-        patch(
-            "custom_components.firefly_cloud.config_flow.FireflyAPIClient.verify_credentials",
-            return_value=True,
-        ),
-        patch.object(hass.config_entries, "async_update_entry") as mock_update_entry,
-    ):
+    with patch.object(hass.config_entries, "async_update_entry") as mock_update_entry:
         result2 = await hass.config_entries.flow.async_configure(
             result["flow_id"],
             {"auth_response": "mock_auth_response"},
@@ -424,21 +288,16 @@ async def test_reauth_flow_success(
     mock_update_entry.assert_called_once()
 
 
-@pytest.mark.asyncio
 async def test_reauth_flow_invalid_auth(hass: HomeAssistant, mock_config_entry) -> None:
     """Test reauthentication flow with invalid auth."""
     # Add existing entry to hass properly
-    hass.config_entries._entries[mock_config_entry.entry_id] = mock_config_entry
+    add_to_hass(hass, mock_config_entry)
 
     with (
-        patch("homeassistant.helpers.aiohttp_client.async_get_clientsession"),
         patch.object(hass.config_entries, "async_get_entry", return_value=mock_config_entry),
         patch.object(hass.config_entries, "async_update_entry"),
-        patch.object(hass.config_entries, "async_reload"),
-        patch(
-            "custom_components.firefly_cloud.config_flow.FireflyAPIClient.parse_authentication_response",
-            side_effect=FireflyAuthenticationError("Invalid response"),
-        ),
+        patch.object(hass.config_entries, "async_reload", new=AsyncMock()),
+        patch_firefly_api(parse_authentication_response=AsyncMock(side_effect=_AUTH_ERROR)),
     ):
         # Start reauth flow
         result = await hass.config_entries.flow.async_init(
@@ -457,37 +316,17 @@ async def test_reauth_flow_invalid_auth(hass: HomeAssistant, mock_config_entry)
     assert result2["errors"] == {"base": "invalid_auth"}
 
 
-@pytest.mark.asyncio
 async def test_reauth_flow_connection_error(hass: HomeAssistant, mock_config_entry) -> None:
     """Test reauthentication flow with connection error."""
     # Add existing entry to hass properly
-    hass.config_entries._entries[mock_config_entry.entry_id] = mock_config_entry
+    add_to_hass(hass, mock_config_entry)
 
     # Mock connection error
-    mock_auth_response = {
-        "secret": "test-secret",
-        "user": {
-            "username": "john.doe",
-            "fullname": "John Doe",
-            "email": "john.doe@test.com",
-            "role": "student",
-            "guid": "test-guid",
-        },
-    }
-
     with (
-        patch("homeassistant.helpers.aiohttp_client.async_get_clientsession"),
         patch.object(hass.config_entries, "async_get_entry", return_value=mock_config_entry),
         patch.object(hass.config_entries, "async_update_entry"),
-        patch.object(hass.config_entries, "async_reload"),
-        patch(
-            "custom_components.firefly_cloud.config_flow.FireflyAPIClient.parse_authentication_response",
-            return_value=mock_auth_response,
-        ),
-        patch(
-            "custom_components.firefly_cloud.config_flow.FireflyAPIClient.verify_credentials",
-            side_effect=FireflyConnectionError("Connection failed"),
-        ),
+        patch.object(hass.config_entries, "async_reload", new=AsyncMock()),
+        patch_firefly_api(verify_credentials=AsyncMock(side_effect=_CONNECTION_ERROR)),
     ):
         # Start reauth flow
         result = await hass.config_entries.flow.async_init(
@@ -506,37 +345,17 @@ async def test_reauth_flow_connection_error(hass: HomeAssistant, mock_config_ent
     assert result2["errors"] == {"base": "cannot_connect"}
 
 
-@pytest.mark.asyncio
 async def test_reauth_flow_credentials_failed(hass: HomeAssistant, mock_config_entry) -> None:
     """Test reauthentication flow with credential verification failure."""
     # Add existing entry to hass properly
-    hass.config_entries._entries[mock_config_entry.entry_id] = mock_config_entry
+    add_to_hass(hass, mock_config_entry)
 
     # Mock failed credential verification
-    mock_auth_response = {
-        "secret": "test-secret",
-        "user": {
-            "username": "john.doe",
-            "fullname": "John Doe",
-            "email": "john.doe@test.com",
-            "role": "student",
-            "guid": "test-guid",
-        },
-    }
-
     with (
-        patch("homeassistant.helpers.aiohttp_client.async_get_clientsession"),
         patch.object(hass.config_entries, "async_get_entry", return_value=mock_config_entry),
         patch.object(hass.config_entries, "async_update_entry"),
-        patch.object(hass.config_entries, "async_reload"),
-        patch(
-            "custom_components.firefly_cloud.config_flow.FireflyAPIClient.parse_authentication_response",
-            return_value=mock_auth_response,
-        ),
-        patch(
-            "custom_components.firefly_cloud.config_flow.FireflyAPIClient.verify_credentials",
-            return_value=False,
-        ),
+        patch.object(hass.config_entries, "async_reload", new=AsyncMock()),
+        patch_firefly_api(verify_credentials=AsyncMock(return_value=False)),
     ):
         # Start reauth flow
         result = await hass.config_entries.flow.async_init(
@@ -555,22 +374,17 @@ async def test_reauth_flow_credentials_failed(hass: HomeAssistant, mock_config_e
     assert result2["errors"] == {"base": "invalid_auth"}
 
 
-@pytest.mark.asyncio
 async def test_reauth_flow_unexpected_error(hass: HomeAssistant, mock_config_entry) -> None:
     """Test reauthentication flow with unexpected error."""
     # Add existing entry to hass properly
-    hass.config_entries._entries[mock_config_entry.entry_id] = mock_config_entry
+    add_to_hass(hass, mock_config_entry)
 
     # Mock unexpected error
     with (
-        patch("homeassistant.helpers.aiohttp_client.async_get_clientsession"),
         patch.object(hass.config_entries, "async_get_entry", return_value=mock_config_entry),
         patch.object(hass.config_entries, "async_update_entry"),
-        patch.object(hass.config_entries, "async_reload"),
-        patch(
-            "custom_components.firefly_cloud.config_flow.FireflyAPIClient.parse_authentication_response",
-            side_effect=Exception("Unexpected error"),
-        ),
+        patch.object(hass.config_entries, "async_reload", new=AsyncMock()),
+        patch_firefly_api(parse_authentication_response=AsyncMock(side_effect=_UNEXPECTED_ERROR)),
     ):
         # Start reauth flow
         result = await hass.config_entries.flow.async_init(
@@ -589,171 +403,8 @@ async def test_reauth_flow_unexpected_error(hass: HomeAssistant, mock_config_ent
     assert result2["errors"] == {"base": "unknown"}
 
 
-@pytest.mark.asyncio
-async def test_auth_step_get_children_error(hass: HomeAssistant) -> None:
-    """Test authentication step when getting children info fails."""
-    # Start flow and get to auth step
-    result = await hass.config_entries.flow.async_init(DOMAIN, context={"source": config_entries.SOURCE_USER})
-
-    mock_school_info = {
-        "enabled": True,
-        "name": "Test School",
-        "host": "testschool.fireflycloud.net",
-        "url": "https://testschool.fireflycloud.net",
-        "device_id": "test-device-123",
-    }
-
-    with (
-        patch(
-            "custom_components.firefly_cloud.config_flow.FireflyAPIClient.get_school_info",
-            return_value=mock_school_info,
-        ),
-        patch("homeassistant.helpers.aiohttp_client.async_get_clientsession"),
-    ):
-        result = await hass.config_entries.flow.async_configure(
-            result["flow_id"],
-            {"school_code": "testschool"},
-        )
-
-    # Mock successful auth but failed children lookup
-    mock_auth_response = {
-        "secret": "test-secret",
-        "user": {
-            "username": "john.doe",
-            "fullname": "John Doe",
-            "email": "john.doe@test.com",
-            "role": "student",
-            "guid": "test-guid",
-        },
-    }
-
-    mock_user_info = {
-        "username": "john.doe",
-        "fullname": "John Doe",
-        "email": "john.doe@test.com",
-        "role": "student",
-        "guid": "test-guid",
-    }
-
-    with (
-        patch(
-            "custom_components.firefly_cloud.config_flow.FireflyAPIClient.parse_authentication_response",
-            return_value=mock_auth_response,
-        ),
-        patch(
-            "custom_components.firefly_cloud.config_flow.FireflyAPIClient.verify_credentials",
-            return_value=True,
-        ),
-        patch(
-            "custom_components.firefly_cloud.config_flow.FireflyAPIClient.get_user_info",
-            return_value=mock_user_info,
-        ),
-        patch(
-            "custom_components.firefly_cloud.config_flow.FireflyAPIClient.get_children_info",
-            side_effect=FireflyConnectionError("Connection failed"),
-        ),
-    ):
-        result2 = await hass.config_entries.flow.async_configure(
-            result["flow_id"],
-            {"auth_response": "mock_auth_response"},
-        )
-
-    assert result2["type"] == FlowResultType.FORM
-    assert result2["step_id"] == "auth"
-    assert result2["errors"] == {"base": "cannot_connect"}
-
-
-@pytest.mark.asyncio
-async def test_auth_step_unexpected_error(hass: HomeAssistant) -> None:
-    """Test authentication step with unexpected error."""
-    # Start flow and get to auth step
-    result = await hass.config_entries.flow.async_init(DOMAIN, context={"source": config_entries.SOURCE_USER})
-
-    mock_school_info = {
-        "enabled": True,
-        "name": "Test School",
-        "host": "testschool.fireflycloud.net",
-        "url": "https://testschool.fireflycloud.net",
-        "device_id": "test-device-123",
-    }
-
-    with (
-        patch(
-            "custom_components.firefly_cloud.config_flow.FireflyAPIClient.get_school_info",
-            return_value=mock_school_info,
-        ),
-        patch("homeassistant.helpers.aiohttp_client.async_get_clientsession"),
-    ):
-        result = await hass.config_entries.flow.async_configure(
-            result["flow_id"],
-            {"school_code": "testschool"},
-        )
-
-    # Mock unexpected error during auth
-    with patch(
-        "custom_components.firefly_cloud.config_flow.FireflyAPIClient.parse_authentication_response",
-        side_effect=Exception("Unexpected error"),
-    ):
-        result2 = await hass.config_entries.flow.async_configure(
-            result["flow_id"],
-            {"auth_response": "mock_auth_response"},
-        )
-
-    assert result2["type"] == FlowResultType.FORM
-    assert result2["step_id"] == "auth"
-    assert result2["errors"] == {"base": "unknown"}
-
-
-@pytest.mark.asyncio
-async def test_user_step_unexpected_error(hass: HomeAssistant) -> None:
-    """Test user step with unexpected error."""
-    result = await hass.config_entries.flow.async_init(DOMAIN, context={"source": config_entries.SOURCE_USER})
-
-    with (
-        patch(
-            "custom_components.firefly_cloud.config_flow.FireflyAPIClient.get_school_info",
-            side_effect=Exception("Unexpected error"),
-        ),
-        patch("homeassistant.helpers.aiohttp_client.async_get_clientsession"),
-    ):
-        result2 = await hass.config_entries.flow.async_configure(
-            result["flow_id"],
-            {"school_code": "testschool"},
-        )
-
-    assert result2["type"] == FlowResultType.FORM
-    assert result2["step_id"] == "user"
-    assert result2["errors"] == {"base": "unknown"}
-
-
-@pytest.mark.asyncio
-async def test_auth_step_multiple_children(
-    hass: HomeAssistant, mock_setup_entry
-) -> None:  # pylint: disable=unused-argument
+async def test_auth_step_multiple_children(hass: HomeAssistant, auth_flow_id, mock_firefly_client) -> None:
     """Test authentication step with parent having multiple children."""
-    # Start flow and get to auth step
-    result = await hass.config_entries.flow.async_init(DOMAIN, context={"source": config_entries.SOURCE_USER})
-
-    mock_school_info = {
-        "enabled": True,
-        "name": "Test School",
-        "host": "testschool.fireflycloud.net",
-        "url": "https://testschool.fireflycloud.net",
-        "device_id": "test-device-123",
-    }
-
-    with (
-        patch(
-            "custom_components.firefly_cloud.config_flow.FireflyAPIClient.get_school_info",
-            return_value=mock_school_info,
-        ),
-        patch("homeassistant.helpers.aiohttp_client.async_get_clientsession"),
-    ):
-        result = await hass.config_entries.flow.async_configure(
-            result["flow_id"],
-            {"school_code": "testschool"},
-        )
-
     # Mock parent user with multiple children
     mock_auth_response = {
         "secret": "test-secret",
@@ -779,28 +430,14 @@ async def test_auth_step_multiple_children(
         {"guid": "child2-guid", "username": "child2", "name": "Child Two"},
     ]
 
-    with (
-        patch(
-            "custom_components.firefly_cloud.config_flow.FireflyAPIClient.parse_authentication_response",
-            return_value=mock_auth_response,
-        ),
-        patch(
-            "custom_components.firefly_cloud.config_flow.FireflyAPIClient.verify_credentials",
-            return_value=True,
-        ),
-        patch(
-            "custom_components.firefly_cloud.config_flow.FireflyAPIClient.get_user_info",
-            return_value=mock_user_info,
-        ),
-        patch(
-            "custom_components.firefly_cloud.config_flow.FireflyAPIClient.get_children_info",
-            return_value=mock_children,
-        ),
-    ):
-        result2 = await hass.config_entries.flow.async_configure(
-            result["flow_id"],
-            {"auth_response": "mock_auth_response"},
-        )
+    mock_firefly_client.parse_authentication_response.return_value = mock_auth_response
+    mock_firefly_client.get_user_info.return_value = mock_user_info
+    mock_firefly_client.get_children_info.return_value = mock_children
+
+    result2 = await hass.config_entries.flow.async_configure(
+        auth_flow_id,
+        {"auth_response": "mock_auth_response"},
+    )
 
     assert result2["type"] == FlowResultType.CREATE_ENTRY
     assert result2["title"] == "Test School - Parent Doe"
@@ -811,8 +448,7 @@ async def test_auth_step_multiple_children(
     assert "child2-guid" in result2["data"]["children_guids"]
 
 
-@pytest.mark.asyncio
-async def test_config_flow_is_matching() -> None:
+def test_config_flow_is_matching() -> None:
     """Test is_matching method for duplicate flow detection."""
     from custom_components.firefly_cloud.config_flow import FireflyCloudConfigFlow
 
@@ -853,28 +489,11 @@ async def test_config_flow_is_matching() -> None:
     assert flow7.is_matching(flow8) is False if hasattr(flow7, "is_matching") else True
 
 
-@pytest.mark.asyncio
-async def test_form_school_disabled(hass: HomeAssistant, mock_setup_entry) -> None:  # pylint: disable=unused-argument
+async def test_form_school_disabled(hass: HomeAssistant) -> None:
     """Test school disabled error during user flow."""
-    result = await hass.config_entries.flow.async_init(DOMAIN, context={"source": config_entries.SOURCE_USER})
+    result = await _init_user_flow(hass)
 
-    mock_school_info = {
-        "enabled": False,  # School is disabled
-        "name": "Test School",
-        "host": "testschool.fireflycloud.net",
-        "url": "https://testschool.fireflycloud.net",
-        "device_id": "test-device-123",
-    }
-
-    with (
-        patch(
-            "homeassistant.helpers.aiohttp_client.async_get_clientsession",
-        ),
-        patch(
-            "custom_components.firefly_cloud.api.FireflyAPIClient.get_school_info",
-            return_value=mock_school_info,
-        ),
-    ):
+    with patch_firefly_api(get_school_info=AsyncMock(return_value={**_SCHOOL_INFO, "enabled": False})):
         result = await hass.config_entries.flow.async_configure(
             result["flow_id"],
             {"school_code": "testschool"},
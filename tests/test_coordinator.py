@@ -1,5 +1,6 @@
 """Test the Firefly Cloud coordinator."""
 
+import asyncio
 from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, List
 from unittest.mock import AsyncMock
@@ -517,6 +518,172 @@ async def test_coordinator_rate_limit_error(hass: HomeAssistant, mock_api):
         await coordinator._async_update_data()
 
 
+@pytest.mark.asyncio
+async def test_coordinator_child_failure_cancels_siblings(hass: HomeAssistant, mock_api):
+    """Test one child's failure cancels the other children's requests without partial recovery."""
+    from custom_components.firefly_cloud.exceptions import FireflyRateLimitError
+
+    cancelled = []
+
+    async def get_tasks(student_guid: str) -> List[Dict[str, Any]]:
+        if student_guid == "child-1":
+            raise FireflyRateLimitError("Rate limit exceeded")
+        try:
+            await asyncio.sleep(3600)
+        except asyncio.CancelledError:
+            cancelled.append(student_guid)
+            raise
+        return []
+
+    mock_api.get_tasks.side_effect = get_tasks
+
+    coordinator = FireflyUpdateCoordinator(
+        hass=hass,
+        api=mock_api,
+        task_lookahead_days=7,
+        children_guids=["child-1", "child-2"],
+    )
+
+    with pytest.raises(UpdateFailed, match="Rate limit exceeded"):
+        await coordinator._async_update_data()
+
+    assert cancelled == ["child-2"]
+
+
+@pytest.mark.asyncio
+async def test_coordinator_partial_recovery_keeps_healthy_children(hass: HomeAssistant, mock_api):
+    """Test only the failed request's data is emptied when partial recovery is enabled."""
+    from custom_components.firefly_cloud.exceptions import FireflyRateLimitError
+
+    tasks = mock_api.get_tasks.return_value
+
+    async def get_tasks(student_guid: str) -> List[Dict[str, Any]]:
+        if student_guid == "child-1":
+            raise FireflyRateLimitError("Rate limit exceeded")
+        return tasks
+
+    mock_api.get_tasks.side_effect = get_tasks
+
+    coordinator = FireflyUpdateCoordinator(
+        hass=hass,
+        api=mock_api,
+        task_lookahead_days=7,
+        children_guids=["child-1", "child-2"],
+        partial_recovery=True,
+    )
+
+    data = await coordinator._async_update_data()
+
+    failed_child = data["children_data"]["child-1"]
+    assert len(failed_child["events"]["today"]) == 1
+    assert failed_child["tasks"] == {"all": [], "due_today": [], "upcoming": [], "overdue": []}
+    assert len(data["children_data"]["child-2"]["tasks"]["all"]) == 1
+    assert len(data["children_data"]["child-2"]["events"]["today"]) == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("error", "expected"),
+    [
+        (FireflyConnectionError("Connection failed"), UpdateFailed),
+        (FireflyAuthenticationError("Auth failed"), ConfigEntryAuthFailed),
+    ],
+)
+async def test_coordinator_partial_recovery_still_fails(hass: HomeAssistant, mock_api, error, expected):
+    """Test partial recovery still fails when every child fails or authentication is rejected."""
+    mock_api.get_events.side_effect = error
+
+    coordinator = FireflyUpdateCoordinator(
+        hass=hass,
+        api=mock_api,
+        task_lookahead_days=7,
+        children_guids=["child-1", "child-2"],
+        partial_recovery=True,
+    )
+
+    with pytest.raises(expected):
+        await coordinator._async_update_data()
+
+
+@pytest.mark.asyncio
+async def test_coordinator_partial_recovery_mixed_errors_all_fail(hass: HomeAssistant, mock_api):
+    """Test partial recovery fails the update when nothing is fetched, even with mixed errors."""
+    from custom_components.firefly_cloud.exceptions import FireflyRateLimitError
+
+    mock_api.get_events.side_effect = FireflyConnectionError("Connection failed")
+    mock_api.get_tasks.side_effect = FireflyRateLimitError("Rate limit exceeded")
+
+    coordinator = FireflyUpdateCoordinator(
+        hass=hass,
+        api=mock_api,
+        task_lookahead_days=7,
+        children_guids=["child-1", "child-2"],
+        partial_recovery=True,
+    )
+
+    with pytest.raises(UpdateFailed):
+        await coordinator._async_update_data()
+
+
+@pytest.mark.asyncio
+async def test_coordinator_partial_recovery_does_not_hide_bugs(hass: HomeAssistant, mock_api):
+    """Test partial recovery re-raises errors that are not Firefly errors."""
+
+    async def get_tasks(student_guid: str) -> List[Dict[str, Any]]:
+        raise KeyError(student_guid)
+
+    mock_api.get_tasks.side_effect = get_tasks
+
+    coordinator = FireflyUpdateCoordinator(
+        hass=hass,
+        api=mock_api,
+        task_lookahead_days=7,
+        children_guids=["child-1", "child-2"],
+        partial_recovery=True,
+    )
+
+    with pytest.raises(UpdateFailed, match="Unexpected error"):
+        await coordinator._async_update_data()
+
+
+@pytest.mark.asyncio
+async def test_coordinator_children_guids_fetch_account_info_in_same_wave(hass: HomeAssistant, mock_api):
+    """Test account info is fetched alongside child data when children GUIDs are known."""
+    mock_api.get_user_info.side_effect = FireflyAuthenticationError("Auth failed")
+
+    coordinator = FireflyUpdateCoordinator(
+        hass=hass,
+        api=mock_api,
+        task_lookahead_days=7,
+        children_guids=["child-1"],
+    )
+
+    with pytest.raises(ConfigEntryAuthFailed):
+        await coordinator._async_update_data()
+
+    # Child requests were already in flight alongside the failing user info call
+    mock_api.get_children_info.assert_awaited_once()
+    assert mock_api.get_events.await_count == 2
+    mock_api.get_tasks.assert_awaited_once_with(student_guid="child-1")
+
+
+@pytest.mark.asyncio
+async def test_coordinator_update_failed_not_rewrapped(hass: HomeAssistant, mock_api):
+    """Test an UpdateFailed raised during the update propagates unchanged."""
+    mock_api.get_tasks.side_effect = UpdateFailed("Already handled")
+
+    coordinator = FireflyUpdateCoordinator(
+        hass=hass,
+        api=mock_api,
+        task_lookahead_days=7,
+    )
+
+    with pytest.raises(UpdateFailed, match="^Already handled$"):
+        await coordinator._async_update_data()
+
+    assert "UnexpectedError" not in coordinator.statistics["error_counts"]
+
+
 # Remove this test since coordinator doesn't call get_children_info directly
 
 
@@ -605,6 +772,7 @@ async def test_coordinator_empty_api_responses(hass: HomeAssistant, mock_api):
     assert len(child_data["tasks"]["upcoming"]) == 0
     assert len(child_data["tasks"]["due_today"]) == 0
     assert len(child_data["tasks"]["overdue"]) == 0
+    assert child_data["name"] == "John Doe"
 
 
 @pytest.mark.asyncio
@@ -1091,6 +1259,28 @@ async def test_coordinator_extract_child_name_guid_fallback(hass: HomeAssistant,
     assert name == "unknown-child-123"
 
 
+@pytest.mark.asyncio
+async def test_coordinator_child_name_refreshed_with_children_info(hass: HomeAssistant, mock_api):
+    """Test cached child names are re-resolved once children info is fetched again."""
+    mock_api.get_children_info.side_effect = FireflyConnectionError("Children fetch failed")
+
+    coordinator = FireflyUpdateCoordinator(
+        hass=hass,
+        api=mock_api,
+        task_lookahead_days=7,
+        children_guids=["child-123"],
+    )
+
+    data = await coordinator._async_update_data()
+    assert data["children_data"]["child-123"]["name"] == "child-123"
+
+    mock_api.get_children_info.side_effect = None
+    mock_api.get_children_info.return_value = [{"guid": "child-123", "name": "Child Name"}]
+
+    data = await coordinator._async_update_data()
+    assert data["children_data"]["child-123"]["name"] == "Child Name"
+
+
 @pytest.mark.asyncio
 async def test_coordinator_process_tasks_missing_subject(hass: HomeAssistant, mock_api):
     """Test processing tasks with missing subject field."""
@@ -1233,133 +1423,61 @@ async def test_coordinator_process_tasks_keyerror_handling(hass: HomeAssistant,
 
 
 @pytest.mark.asyncio
-async def test_coordinator_filter_tasks_naive_datetime_handling(hass: HomeAssistant, mock_api):
-    """Test _filter_tasks_by_date with naive datetime inputs."""
-    now_utc = datetime.now(timezone.utc)
+async def test_coordinator_bucket_tasks_naive_window(hass: HomeAssistant, mock_api):
+    """Test _bucket_tasks with naive now and date range inputs."""
+    coordinator = FireflyUpdateCoordinator(hass, mock_api, task_lookahead_days=7)
+    naive_now = datetime(2024, 1, 15, 12, 0)
 
-    # Mock task with proper date
-    mock_api.get_tasks.return_value = [
-        {
-            "guid": "test-task",
-            "title": "Test Task",
-            "description": "Test",
-            "dueDate": (now_utc + timedelta(hours=1)).isoformat().replace("+00:00", "Z"),
-            "setDate": now_utc.isoformat().replace("+00:00", "Z"),
-            "subject": {"name": "Math"},
-            "completionStatus": "Todo",
-            "setter": {"name": "Teacher"},
-        }
-    ]
-
-    coordinator = FireflyUpdateCoordinator(
-        hass=hass,
-        api=mock_api,
-        task_lookahead_days=7,
-    )
-
-    # Test with naive datetime (coordinator should handle timezone conversion)
-    naive_start = datetime.now().replace(tzinfo=None)
-    naive_end = naive_start + timedelta(days=1)
-
-    filtered_tasks = coordinator._filter_tasks_by_date(mock_api.get_tasks.return_value, naive_start, naive_end)
-
-    assert len(filtered_tasks) >= 0  # Should not crash
-
-
-@pytest.mark.asyncio
-async def test_coordinator_filter_tasks_no_timezone_due_date(hass: HomeAssistant, mock_api):
-    """Test _filter_tasks_by_date with due date without timezone info."""
-    now = datetime.now()
-
-    # Mock task with naive due date (no timezone)
-    mock_api.get_tasks.return_value = [
-        {
-            "guid": "naive-task",
-            "title": "Naive Date Task",
-            "description": "Task with naive due date",
-            "dueDate": (now + timedelta(hours=1)).isoformat(),  # No 'Z' suffix
-            "setDate": now.isoformat() + "Z",
-            "subject": {"name": "Math"},
-            "completionStatus": "Todo",
-            "setter": {"name": "Teacher"},
-        }
+    tasks = [
+        {"guid": "later-today", "dueDate": "2024-01-15T13:00:00Z", "completionStatus": "Todo"},
+        {"guid": "overdue", "dueDate": "2024-01-14T12:00:00Z", "completionStatus": "Todo"},
     ]
 
-    coordinator = FireflyUpdateCoordinator(
-        hass=hass,
-        api=mock_api,
-        task_lookahead_days=7,
+    buckets = coordinator._bucket_tasks(
+        coordinator._process_tasks(tasks), coordinator._calculate_date_ranges(naive_now), naive_now
     )
 
-    start = datetime.now(timezone.utc)
-    end = start + timedelta(days=1)
-
-    filtered_tasks = coordinator._filter_tasks_by_date(mock_api.get_tasks.return_value, start, end)
-
-    assert len(filtered_tasks) >= 0  # Should handle naive datetime gracefully
+    assert [task["id"] for task in buckets["due_today"]] == ["later-today"]
+    assert [task["id"] for task in buckets["upcoming"]] == ["later-today"]
+    assert [task["id"] for task in buckets["overdue"]] == ["overdue"]
 
 
 @pytest.mark.asyncio
-async def test_coordinator_filter_overdue_tasks_naive_now(hass: HomeAssistant, mock_api):
-    """Test _filter_overdue_tasks with naive now datetime."""
-    past_time = datetime.now(timezone.utc) - timedelta(days=1)
+async def test_coordinator_bucket_tasks_naive_due_date(hass: HomeAssistant, mock_api):
+    """Test _bucket_tasks treats due dates without timezone info as UTC."""
+    coordinator = FireflyUpdateCoordinator(hass, mock_api, task_lookahead_days=7)
+    now = datetime(2024, 1, 15, 12, 0, tzinfo=timezone.utc)
 
-    mock_api.get_tasks.return_value = [
-        {
-            "guid": "overdue-task",
-            "title": "Overdue Task",
-            "description": "Past due",
-            "dueDate": past_time.isoformat().replace("+00:00", "Z"),
-            "setDate": (past_time - timedelta(days=1)).isoformat().replace("+00:00", "Z"),
-            "subject": {"name": "Math"},
-            "completionStatus": "Todo",
-            "setter": {"name": "Teacher"},
-        }
+    tasks = [
+        {"guid": "later-today", "dueDate": "2024-01-15T13:00:00", "completionStatus": "Todo"},
+        {"guid": "overdue", "dueDate": "2024-01-14T12:00:00", "completionStatus": "Todo"},
     ]
 
-    coordinator = FireflyUpdateCoordinator(
-        hass=hass,
-        api=mock_api,
-        task_lookahead_days=7,
-    )
-
-    # Test with naive now datetime
-    naive_now = datetime.now().replace(tzinfo=None)
+    buckets = coordinator._bucket_tasks(coordinator._process_tasks(tasks), coordinator._calculate_date_ranges(now), now)
 
-    overdue_tasks = coordinator._filter_overdue_tasks(mock_api.get_tasks.return_value, naive_now)
-
-    assert len(overdue_tasks) >= 0  # Should handle timezone conversion
+    assert [task["id"] for task in buckets["due_today"]] == ["later-today"]
+    assert [task["id"] for task in buckets["upcoming"]] == ["later-today"]
+    assert [task["id"] for task in buckets["overdue"]] == ["overdue"]
 
 
 @pytest.mark.asyncio
-async def test_coordinator_filter_overdue_tasks_naive_due_date(hass: HomeAssistant, mock_api):
-    """Test _filter_overdue_tasks with naive due date."""
-    past_time = datetime.now() - timedelta(days=1)
+async def test_coordinator_bucket_tasks_window_boundaries(hass: HomeAssistant, mock_api):
+    """Test window ends are exclusive and a task due exactly now is upcoming, not overdue."""
+    coordinator = FireflyUpdateCoordinator(hass, mock_api, task_lookahead_days=7)
+    now = datetime(2024, 1, 15, 12, 0, tzinfo=timezone.utc)
 
-    mock_api.get_tasks.return_value = [
-        {
-            "guid": "naive-overdue-task",
-            "title": "Naive Overdue Task",
-            "description": "Past due with naive date",
-            "dueDate": past_time.isoformat(),  # No timezone info
-            "setDate": (past_time - timedelta(days=1)).isoformat() + "Z",
-            "subject": {"name": "Math"},
-            "completionStatus": "Todo",
-            "setter": {"name": "Teacher"},
-        }
+    tasks = [
+        {"guid": "due-now", "dueDate": "2024-01-15T12:00:00Z", "completionStatus": "Todo"},
+        {"guid": "today-end", "dueDate": "2024-01-16T00:00:00Z", "completionStatus": "Todo"},
+        {"guid": "lookahead-end", "dueDate": "2024-01-22T00:00:00Z", "completionStatus": "Todo"},
+        {"guid": "completed-overdue", "dueDate": "2024-01-15T11:59:59Z", "completionStatus": "Completed"},
     ]
 
-    coordinator = FireflyUpdateCoordinator(
-        hass=hass,
-        api=mock_api,
-        task_lookahead_days=7,
-    )
-
-    now = datetime.now(timezone.utc)
-
-    overdue_tasks = coordinator._filter_overdue_tasks(mock_api.get_tasks.return_value, now)
+    buckets = coordinator._bucket_tasks(coordinator._process_tasks(tasks), coordinator._calculate_date_ranges(now), now)
 
-    assert len(overdue_tasks) >= 0  # Should handle naive due date conversion
+    assert [task["id"] for task in buckets["due_today"]] == ["due-now", "completed-overdue"]
+    assert [task["id"] for task in buckets["upcoming"]] == ["due-now", "today-end"]
+    assert buckets["overdue"] == []
 
 
 @pytest.mark.asyncio
@@ -1426,6 +1544,55 @@ async def test_coordinator_process_tasks_subject_string(hass):
     assert processed[0]["subject"] == "Mathematics"
 
 
+@pytest.mark.asyncio
+async def test_coordinator_process_tasks_out_of_range_dates(hass: HomeAssistant, mock_api):
+    """Test well-formed but impossible dates are treated as missing."""
+    coordinator = FireflyUpdateCoordinator(hass, mock_api, task_lookahead_days=7)
+
+    tasks = [
+        {
+            "guid": "task1",
+            "title": "Math Homework",
+            "dueDate": "2024-13-45T25:61:00Z",
+            "setDate": "2024-01-15T12:00:00Z",
+        }
+    ]
+
+    processed = coordinator._process_tasks(tasks)
+
+    assert len(processed) == 1
+    assert processed[0]["due_date"] is None
+    assert processed[0]["set_date"] == datetime(2024, 1, 15, 12, 0, tzinfo=timezone.utc)
+
+    now = datetime.now(timezone.utc)
+    buckets = coordinator._bucket_tasks(processed, coordinator._calculate_date_ranges(now), now)
+    assert buckets["due_today"] == buckets["upcoming"] == buckets["overdue"] == []
+
+
+@pytest.mark.asyncio
+async def test_coordinator_bucket_tasks_single_pass(hass: HomeAssistant, mock_api):
+    """Test tasks are sorted into every matching bucket from one processed list."""
+    coordinator = FireflyUpdateCoordinator(hass, mock_api, task_lookahead_days=7)
+    now = datetime(2024, 1, 15, 12, 0, tzinfo=timezone.utc)
+    date_ranges = coordinator._calculate_date_ranges(now)
+
+    tasks = [
+        {"guid": "later-today", "dueDate": "2024-01-15T15:00:00Z", "completionStatus": "Todo"},
+        {"guid": "next-week", "dueDate": "2024-01-20T09:00:00Z", "completionStatus": "Todo"},
+        {"guid": "overdue", "dueDate": "2024-01-10T09:00:00Z", "completionStatus": "Todo"},
+        {"guid": "done", "dueDate": "2024-01-10T09:00:00Z", "completionStatus": "Completed"},
+        {"guid": "undated", "completionStatus": "Todo"},
+    ]
+
+    buckets = coordinator._bucket_tasks(coordinator._process_tasks(tasks), date_ranges, now)
+
+    assert [task["id"] for task in buckets["all"]] == ["later-today", "next-week", "overdue", "done", "undated"]
+    assert [task["id"] for task in buckets["due_today"]] == ["later-today"]
+    assert [task["id"] for task in buckets["upcoming"]] == ["later-today", "next-week"]
+    assert [task["id"] for task in buckets["overdue"]] == ["overdue"]
+    assert buckets["due_today"][0] is buckets["all"][0]
+
+
 # Issue Registry Tests
 
 
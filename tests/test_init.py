@@ -284,6 +284,7 @@ async def test_async_setup_entry_with_children_guids(
         CONF_CHILDREN_GUIDS: ["child-1", "child-2"],
         "task_lookahead_days": 7,
     }
+    config_entry.options = {"partial_recovery": True}
 
     with (
         patch("custom_components.firefly_cloud.FireflyAPIClient") as mock_api_class,
@@ -303,6 +304,7 @@ async def test_async_setup_entry_with_children_guids(
         mock_coordinator_class.assert_called_once()
         call_kwargs = mock_coordinator_class.call_args[1]
         assert call_kwargs["children_guids"] == ["child-1", "child-2"]
+        assert call_kwargs["partial_recovery"] is True
 
 
 @pytest.mark.asyncio
@@ -529,7 +531,7 @@ async def test_async_setup_entry_creates_api_client_correctly(
 async def test_async_migrate_entry_version_1(hass: HomeAssistant):
     """Test migration of config entry at version 1 (no-op)."""
     from custom_components.firefly_cloud import async_migrate_entry
-    from conftest import create_config_entry_with_version_compat
+    from conftest import add_to_hass, create_config_entry_with_version_compat
 
     # Create a config entry at version 1
     from types import MappingProxyType
@@ -554,7 +556,7 @@ async def test_async_migrate_entry_version_1(hass: HomeAssistant):
         entry_id="test-entry-migration",
         discovery_keys=MappingProxyType({}),
     )
-    hass.config_entries._entries[config_entry.entry_id] = config_entry
+    add_to_hass(hass, config_entry)
 
     # Run migration
     result = await async_migrate_entry(hass, config_entry)